@@ -0,0 +1,162 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython build of the tree reaction placement kernel.
+
+Mirrors _place in tree_layout_algorithm.py for users who do not want a Numba
+dependency. Built on import through pyximport when Cython is installed.
+"""
+
+from libc.math cimport cos, sin
+from libc.stdlib cimport malloc, free
+
+
+def place(const int[::1] children_flat,
+          const int[::1] children_offsets,
+          const double[::1] rotation_cos,
+          const double[::1] rotation_sin,
+          const int[::1] rotation_start,
+          double branch_angle,
+          int root_idx,
+          double root_x,
+          double root_y,
+          double base_length,
+          const double[::1] length_factors,
+          double min_length,
+          int max_depth,
+          double[:, ::1] out_xy,
+          unsigned char[::1] placed):
+    """
+    Place all descendants of a root node over a CSR-flattened tree.
+
+    See _place in tree_layout_algorithm.py for the arguments; placed is passed
+    as a uint8 view of the bool mask.
+
+    Raises:
+        MemoryError: If the per-node state or the stack cannot be allocated
+    """
+    cdef int status
+    with nogil:
+        status = _place(children_flat, children_offsets, rotation_cos, rotation_sin,
+                        rotation_start, branch_angle, root_idx, root_x, root_y,
+                        base_length, length_factors, min_length, max_depth, out_xy, placed)
+    if status < 0:
+        raise MemoryError("not enough memory to place %d nodes" % out_xy.shape[0])
+
+
+cdef int _place(const int[::1] children_flat,
+                const int[::1] children_offsets,
+                const double[::1] rotation_cos,
+                const double[::1] rotation_sin,
+                const int[::1] rotation_start,
+                double branch_angle,
+                int root_idx,
+                double root_x,
+                double root_y,
+                double base_length,
+                const double[::1] length_factors,
+                double min_length,
+                int max_depth,
+                double[:, ::1] out_xy,
+                unsigned char[::1] placed) noexcept nogil:
+    """
+    Body of place, without the GIL. Returns 0, or -1 if an allocation failed.
+    """
+    cdef int n = out_xy.shape[0]
+    cdef int stack_size = children_flat.shape[0] + 1
+    cdef int top = 0
+    cdef int node = root_idx
+    cdef int parent, child, link, num_branches, start, i
+    cdef double cos_a, sin_a, length
+    cdef double cos_step = 1.0, sin_step = 0.0, cos_d = 0.0, sin_d = 0.0, next_cos
+    # Rotation of the outermost branch, where uncached fanouts start their spread
+    cdef double cos_spread = cos(branch_angle)
+    cdef double sin_spread = sin(branch_angle)
+
+    # Per-node branch state and the explicit (child, parent, rotation) stack, carved
+    # out of one double and one int buffer
+    cdef double *state = <double *> malloc((3 * n + 2 * stack_size) * sizeof(double))
+    cdef int *indices = <int *> malloc((n + 2 * stack_size) * sizeof(int))
+    if state == NULL or indices == NULL:
+        free(state)
+        free(indices)
+        return -1
+    cdef double *dir_cos = state
+    cdef double *dir_sin = state + n
+    cdef double *lengths = state + 2 * n
+    cdef double *stack_cos = state + 3 * n
+    cdef double *stack_sin = state + 3 * n + stack_size
+    cdef int *depths = indices
+    cdef int *stack_child = indices + n
+    cdef int *stack_parent = indices + n + stack_size
+
+    out_xy[root_idx, 0] = root_x
+    out_xy[root_idx, 1] = root_y
+    placed[root_idx] = 1
+    dir_cos[root_idx] = 0.0  # Start pointing upward
+    dir_sin[root_idx] = -1.0
+    lengths[root_idx] = base_length
+    depths[root_idx] = 1
+
+    while True:
+        # Push the unplaced children of the node placed last, in reverse for preorder
+        if depths[node] < max_depth and lengths[node] >= min_length:
+            num_branches = 0
+            for link in range(children_offsets[node], children_offsets[node + 1]):
+                if not placed[children_flat[link]]:
+                    num_branches += 1
+
+            if num_branches:
+                start = -1
+                if num_branches < rotation_start.shape[0]:
+                    start = rotation_start[num_branches]
+                if start < 0:
+                    # Fanout 1 is always in the table, so num_branches > 1 here. Walk the
+                    # spread from +branch_angle down in equal steps by angle addition
+                    cos_step = cos(2.0 * branch_angle / (num_branches - 1))
+                    sin_step = sin(2.0 * branch_angle / (num_branches - 1))
+                    cos_d = cos_spread
+                    sin_d = sin_spread
+                i = num_branches
+                for link in range(children_offsets[node + 1] - 1, children_offsets[node] - 1, -1):
+                    child = children_flat[link]
+                    if placed[child]:
+                        continue
+                    i -= 1
+                    if start >= 0:
+                        stack_cos[top] = rotation_cos[start + i]
+                        stack_sin[top] = rotation_sin[start + i]
+                    else:
+                        stack_cos[top] = cos_d
+                        stack_sin[top] = sin_d
+                        next_cos = cos_d * cos_step + sin_d * sin_step
+                        sin_d = sin_d * cos_step - cos_d * sin_step
+                        cos_d = next_cos
+                    stack_child[top] = child
+                    stack_parent[top] = node
+                    top += 1
+
+        # Pop the next child that has not been positioned yet
+        node = -1
+        while top > 0:
+            top -= 1
+            if not placed[stack_child[top]]:
+                node = stack_child[top]
+                break
+        if node < 0:
+            break
+
+        parent = stack_parent[top]
+        cos_a = dir_cos[parent] * stack_cos[top] - dir_sin[parent] * stack_sin[top]
+        sin_a = dir_sin[parent] * stack_cos[top] + dir_cos[parent] * stack_sin[top]
+        length = lengths[parent]
+        out_xy[node, 0] = out_xy[parent, 0] + length * cos_a
+        out_xy[node, 1] = out_xy[parent, 1] + length * sin_a
+        placed[node] = 1
+        dir_cos[node] = cos_a
+        dir_sin[node] = sin_a
+        lengths[node] = length * length_factors[node]
+        depths[node] = depths[parent] + 1
+
+    free(state)
+    free(indices)
+    return 0
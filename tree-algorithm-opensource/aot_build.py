@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time build of the Numba placement kernel
+
+Compiles _place from tree_layout_algorithm into the _tree_kernel extension module,
+so layouts skip Numba's JIT warmup on the first call. tree_layout_algorithm uses
+the extension when it can be imported and falls back to JIT compilation otherwise.
+
+Usage: python aot_build.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+import tree_layout_algorithm
+
+# Arguments of _place: CSR tree, rotation table, branch angle, root index and
+# position, base length, length factors, length and depth limits, outputs
+PLACE_SIGNATURE = (
+    'void(i4[::1], i4[::1], f8[::1], f8[::1], i4[::1], f8, i8, f8, f8, f8, f8[::1], '
+    'f8, i8, f8[:, ::1], b1[::1])'
+)
+
+cc = CC('_tree_kernel')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# _place is wrapped in a JIT dispatcher when Numba is installed; export the plain function
+cc.export('place', PLACE_SIGNATURE)(
+    getattr(tree_layout_algorithm._place, 'py_func', tree_layout_algorithm._place)
+)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -13,7 +13,8 @@ def main():
         branch_angle=math.radians(35),  # 35 degree spread
         branch_factor=0.85,             # 85% length scaling
         min_branch_length=30.0,         # Minimum branch length
-        max_depth=10000                 # No depth limit
+        max_depth=10000,                # No depth limit
+        seed=42                         # Reproducible length variation
     )
     
     # Example tree data - a simple organizational chart
@@ -48,6 +49,23 @@ def main():
         node_name = nodes[node_id]['name']
         print(f"{node_name:25} ({node_id:5}): ({x:6.1f}, {y:6.1f})")
     
+    # Layout again as arrays, ready for vectorized use (e.g. matplotlib scatter). A new
+    # instance with the same parameters and seed reproduces the positions above
+    array_layout = TreeLayoutAlgorithm(
+        branch_angle=math.radians(35),
+        branch_factor=0.85,
+        min_branch_length=30.0,
+        max_depth=10000,
+        seed=42
+    )
+    ids, xy = array_layout.layout_tree_arrays(nodes, links, root_x=400, root_y=100)
+    print("\nArray Form:")
+    print("=" * 50)
+    print(f"ids: {ids.tolist()}")
+    print(f"xy: {xy.round(1).tolist()}")
+    print(f"xy shape: {xy.shape}, bounds: x [{xy[:, 0].min():.1f}, {xy[:, 0].max():.1f}], "
+          f"y [{xy[:, 1].min():.1f}, {xy[:, 1].max():.1f}]")
+    
     print("\nTree Structure:")
     print("=" * 50)
     print("CEO")
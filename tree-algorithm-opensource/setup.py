@@ -3,7 +3,25 @@
 Setup script for Tree Reaction Algorithms
 """
 
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # The Cython placement and simulation kernels are optional
+    ext_modules = []
+else:
+    ext_modules = cythonize([
+        "_tree_core.pyx",
+        Extension("tree_reaction_core", ["tree_reaction_core.pyx"],
+                  extra_compile_args=["-O3", "-ffast-math"]),
+    ], language_level=3)
+
+try:
+    from aot_build import cc
+except ImportError:  # The Numba AOT placement kernel is optional
+    pass
+else:
+    ext_modules.append(cc.distutils_extension())
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -21,13 +39,13 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/tree-reaction-algorithms",
     packages=find_packages(),
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
@@ -37,9 +55,18 @@ setup(
         "Topic :: Scientific/Engineering :: Visualization",
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=requirements,
     extras_require={
+        "numba": [
+            "numba>=0.56",
+        ],
+        "cython": [
+            "cython>=0.29.31",
+        ],
+        "gpu": [
+            "cupy>=9.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "black>=21.0",
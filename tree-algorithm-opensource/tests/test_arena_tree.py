@@ -0,0 +1,140 @@
+"""
+Check that every way of growing the simulation tree keeps the ArenaTree bookkeeping
+consistent: leaf_count, unstatic_children and parent_idx are recounted from the
+arrays and every child must start at its parent's end point.
+
+Paths whose dependency is not installed are skipped.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+pytest.importorskip("pygame")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tree_reaction_simulation as sim
+
+
+class InlinePool:
+    """
+    Stand-in for the worker pool that builds the subtrees in this process.
+    """
+
+    @staticmethod
+    def map(function, iterable):
+        return [function(item) for item in iterable]
+
+
+def small_tree() -> sim.ArenaTree:
+    """
+    Create the trunk of new_tree in an arena small enough to be grown several times.
+    """
+    tree = sim.ArenaTree(capacity=8)
+    tree.add_branch(sim.WIDTH // 2, sim.HEIGHT - 50, -np.pi / 2, 100, 1)
+    return tree
+
+
+def check_consistent(tree: sim.ArenaTree) -> None:
+    """
+    Assert that the counters and parent links of a tree match its arrays.
+    """
+    n = tree.size
+    parents = tree.parent_idx[:n]
+    children = np.flatnonzero(parents >= 0)
+    parents_of_children = parents[children]
+
+    # Parents are created before their children, one level up
+    assert (parents_of_children < children).all()
+    np.testing.assert_array_equal(tree.depth[children], tree.depth[parents_of_children] + 1)
+    np.testing.assert_array_equal(tree.start_x[children], tree.end_x[parents_of_children])
+    np.testing.assert_array_equal(tree.start_y[children], tree.end_y[parents_of_children])
+
+    child_count = np.bincount(parents_of_children, minlength=n)
+    assert tree.leaf_count == np.count_nonzero(child_count == 0)
+
+    unstatic = (tree.flags[children] & sim.STATIC) == 0
+    np.testing.assert_array_equal(
+        tree.unstatic_children[:n], np.bincount(parents_of_children[unstatic], minlength=n))
+
+
+def check_grown(tree: sim.ArenaTree) -> None:
+    """
+    Assert that every branch of an instantly grown tree is at full length.
+    """
+    n = tree.size
+    assert n > 1
+    np.testing.assert_array_equal(tree.length[:n], tree.target_length[:n])
+    check_consistent(tree)
+
+
+def test_grow_branch_instantly():
+    sim.seed_samples(3)
+    tree = small_tree()
+    sim.grow_branch_instantly(tree, 0)
+    check_grown(tree)
+
+
+def test_grow_subtree_compiled():
+    if sim.njit is None:
+        pytest.skip("Numba is not installed")
+    sim.seed_samples(3)
+    tree = small_tree()
+    sim.grow_subtree_compiled(tree, 0)
+
+    # The kernel stops whenever the arena is full and resumes from its stack
+    assert tree.capacity > 8
+    check_grown(tree)
+
+
+def test_instant_grow_merges_subtrees(monkeypatch):
+    monkeypatch.setattr(sim, "njit", None)
+    monkeypatch.setattr(sim, "_get_instant_grow_pool", InlinePool)
+    sim.seed_samples(3)
+    tree = small_tree()
+    sim.instant_grow_all_branches(tree)
+
+    # The trunk's children each came back as a merged subtree
+    assert np.count_nonzero(tree.parent_idx[:tree.size] == 0) >= 1
+    check_grown(tree)
+
+
+def grow_animated(monkeypatch, step_cython) -> sim.ArenaTree:
+    """
+    Grow a tree frame by frame with the given Cython step (None for grow_all),
+    checking it along the way.
+    """
+    monkeypatch.setattr(sim, "_step_cython", step_cython)
+    sim.seed_samples(5)
+    tree = sim.new_tree()
+    frame = 0
+    while tree.live_branches().size:
+        sim.update_tree(tree, True)
+        frame += 1
+        if frame % 50 == 0:
+            check_consistent(tree)
+    check_consistent(tree)
+    assert (tree.flags[:tree.size] & sim.STATIC).all()
+    return tree
+
+
+def test_growth_steps_match(monkeypatch):
+    if sim._step_cython is None:
+        pytest.skip("Cython growth step could not be built")
+    cython_tree = grow_animated(monkeypatch, sim._step_cython)
+    numpy_tree = grow_animated(monkeypatch, None)
+
+    assert cython_tree.size == numpy_tree.size
+    assert cython_tree.leaf_count == numpy_tree.leaf_count
+    for name in sim.ARENA_ARRAYS:
+        np.testing.assert_array_equal(getattr(cython_tree, name)[:cython_tree.size],
+                                      getattr(numpy_tree, name)[:numpy_tree.size], err_msg=name)
+
+
+def test_numpy_growth_step(monkeypatch):
+    grow_animated(monkeypatch, None)
@@ -0,0 +1,109 @@
+"""
+Check that every available placement path gives the same layout for the same seed.
+
+Each compiled path is forced in turn and compared against the pure-Python
+place_all; paths whose dependency is not installed are skipped.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tree_layout_algorithm as tla
+
+
+def random_graph(seed: int, size: int, extra_links: int = 0):
+    """
+    Build a random tree, plus extra links that turn it into a DAG.
+
+    Args:
+        seed: Seed for the random structure
+        size: Number of nodes
+        extra_links: Number of additional links to already linked nodes
+
+    Returns:
+        Tuple of (nodes, links) in the format taken by layout_tree_arrays
+    """
+    rng = np.random.default_rng(seed)
+    nodes = {f"n{i}": {} for i in range(size)}
+    links = [{"from": f"n{rng.integers(i)}", "to": f"n{i}"} for i in range(1, size)]
+    links += [{"from": f"n{rng.integers(size)}", "to": f"n{rng.integers(1, size)}"}
+              for _ in range(extra_links)]
+    return nodes, links
+
+
+GRAPHS = {
+    "tree": random_graph(0, 300),
+    "dag": random_graph(1, 300, extra_links=60),
+}
+
+
+def cython_place():
+    """
+    Build the Cython kernel, which tree_layout_algorithm skips when Numba is installed.
+    """
+    try:
+        import pyximport
+    except ImportError:
+        return None
+    importers = pyximport.install(language_level=3)
+    try:
+        from _tree_core import place
+    except ImportError:
+        return None
+    finally:
+        pyximport.uninstall(*importers)
+    return place
+
+
+def layout(monkeypatch, graph: str, place_aot=None, jit=None, place_cython=None):
+    """
+    Lay out a graph with only the given kernels enabled.
+    """
+    monkeypatch.setattr(tla, "_place_aot", place_aot)
+    monkeypatch.setattr(tla, "njit", jit)
+    monkeypatch.setattr(tla, "_place_cython", place_cython)
+    nodes, links = GRAPHS[graph]
+    algorithm = tla.TreeLayoutAlgorithm(min_branch_length=5.0, seed=7)
+    return algorithm.layout_tree_arrays(nodes, links)
+
+
+@pytest.mark.parametrize("graph", sorted(GRAPHS))
+@pytest.mark.parametrize("path", ["numba", "aot", "cython"])
+def test_kernel_matches_python(monkeypatch, graph, path):
+    if path == "numba":
+        if tla.njit is None:
+            pytest.skip("Numba is not installed")
+        kernels = {"jit": tla.njit}
+    elif path == "aot":
+        if tla._place_aot is None:
+            pytest.skip("_tree_kernel is not built (python aot_build.py)")
+        kernels = {"place_aot": tla._place_aot}
+    else:
+        place = cython_place()
+        if place is None:
+            pytest.skip("Cython kernel could not be built")
+        kernels = {"place_cython": place}
+
+    expected_ids, expected_xy = layout(monkeypatch, graph)
+    ids, xy = layout(monkeypatch, graph, **kernels)
+
+    assert ids.tolist() == expected_ids.tolist()
+    np.testing.assert_allclose(xy, expected_xy, rtol=0, atol=1e-9)
+
+
+def test_gpu_matches_python(monkeypatch):
+    pytest.importorskip("cupy")
+    expected_ids, expected_xy = layout(monkeypatch, "tree")
+    nodes, links = GRAPHS["tree"]
+    ids, xy = tla.TreeLayoutAlgorithm(min_branch_length=5.0, seed=7).layout_tree_gpu(nodes, links)
+
+    # Levels are placed breadth-first, so only the node order may differ
+    order = {node_id: i for i, node_id in enumerate(ids.tolist())}
+    assert sorted(order) == sorted(expected_ids.tolist())
+    positions = xy[[order[node_id] for node_id in expected_ids.tolist()]]
+    np.testing.assert_allclose(positions, expected_xy, rtol=0, atol=1e-6)
@@ -0,0 +1,46 @@
+"""
+Check the node count ranges of calculate_dynamic_parameters at their boundaries.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tree_layout_algorithm import TreeLayoutAlgorithm
+
+
+@pytest.mark.parametrize("node_count, expected", [
+    (0, (100, 60)),
+    (10, (100, 60)),
+    (11, (120, 80)),
+    (30, (120, 80)),
+    (31, (150, 100)),
+    (60, (150, 100)),
+    (61, (180, 120)),
+    (10 ** 6, (180, 120)),
+])
+def test_default_ranges(node_count, expected):
+    assert TreeLayoutAlgorithm().calculate_dynamic_parameters(node_count) == expected
+
+
+def test_assigned_configs_are_used():
+    algorithm = TreeLayoutAlgorithm()
+    algorithm.scaling_configs = {
+        (0, 5): {"base_length": 10, "base_spacing": 1},
+        (6, float('inf')): {"base_length": 20, "base_spacing": 2},
+    }
+
+    assert algorithm.calculate_dynamic_parameters(5) == (10, 1)
+    assert algorithm.calculate_dynamic_parameters(6) == (20, 2)
+
+
+def test_in_place_edits_apply_once_assigned():
+    algorithm = TreeLayoutAlgorithm()
+    configs = algorithm.scaling_configs
+    configs[(0, 10)] = {"base_length": 50, "base_spacing": 30}
+    algorithm.scaling_configs = configs
+
+    assert algorithm.calculate_dynamic_parameters(10) == (50, 30)
@@ -20,9 +20,269 @@ This algorithm is unique in that it focuses on natural tree aesthetics rather th
 compactness or tidiness, creating visually appealing hierarchical layouts.
 """
 
+import bisect
 import math
-import random
-from typing import Dict, List, Tuple, Optional, Set
+from collections import defaultdict
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to the Cython or pure-Python placement
+    njit = None
+
+
+def _place(children_flat, children_offsets, rotation_cos, rotation_sin, rotation_start,
+           branch_angle, root_idx, root_x, root_y, base_length, length_factors,
+           min_length, max_depth, out_xy, placed):
+    """
+    Place all descendants of a root node over a CSR-flattened tree.
+    
+    Compiled with Numba when it is available. Nodes are visited depth-first in the
+    same order as the original recursive placement, using an explicit stack of
+    (child, parent, rotation) frames instead of Python recursion. Each node carries
+    the (cos, sin) of its branch direction, which is rotated by the cached offset
+    of each child branch.
+    
+    Args:
+        children_flat: Child indices of every node, concatenated (int32)
+        children_offsets: Start of each node's children in children_flat (int32, N + 1)
+        rotation_cos, rotation_sin: Concatenated per-fanout branch rotation tables
+        rotation_start: Start of each fanout's table, or -1 if it is not cached (always
+            cached for a single child)
+        branch_angle: Maximum spread angle for branches (in radians)
+        root_idx: Index of the root node
+        root_x, root_y: Position of the root node
+        base_length: Branch length from the root to its children
+        length_factors: Pre-drawn random length scaling for each node
+        min_length: Minimum length before stopping branch creation
+        max_depth: Maximum tree depth
+        out_xy: (N, 2) float64 array receiving node positions
+        placed: (N,) bool array marking positioned nodes
+    """
+    n = out_xy.shape[0]
+    dir_cos = np.empty(n, dtype=np.float64)
+    dir_sin = np.empty(n, dtype=np.float64)
+    lengths = np.empty(n, dtype=np.float64)
+    depths = np.empty(n, dtype=np.int32)
+    
+    # Every link is pushed at most once, so the stack never outgrows the edge count
+    stack_size = children_flat.shape[0] + 1
+    stack_child = np.empty(stack_size, dtype=np.int32)
+    stack_parent = np.empty(stack_size, dtype=np.int32)
+    stack_cos = np.empty(stack_size, dtype=np.float64)
+    stack_sin = np.empty(stack_size, dtype=np.float64)
+    top = 0
+    
+    out_xy[root_idx, 0] = root_x
+    out_xy[root_idx, 1] = root_y
+    placed[root_idx] = True
+    dir_cos[root_idx] = 0.0  # Start pointing upward
+    dir_sin[root_idx] = -1.0
+    lengths[root_idx] = base_length
+    depths[root_idx] = 1
+    node = root_idx
+    
+    # Rotation of the outermost branch, where uncached fanouts start their spread
+    cos_spread = np.cos(branch_angle)
+    sin_spread = np.sin(branch_angle)
+    
+    while True:
+        # Push the unplaced children of the node placed last, in reverse for preorder
+        if depths[node] < max_depth and lengths[node] >= min_length:
+            num_branches = 0
+            for link in range(children_offsets[node], children_offsets[node + 1]):
+                if not placed[children_flat[link]]:
+                    num_branches += 1
+            
+            if num_branches:
+                start = -1
+                if num_branches < rotation_start.shape[0]:
+                    start = rotation_start[num_branches]
+                if start < 0:
+                    # Fanout 1 is always in the table, so num_branches > 1 here. Walk the
+                    # spread from +branch_angle down in equal steps by angle addition, so
+                    # only the step needs trig instead of every child's offset
+                    step = 2.0 * branch_angle / (num_branches - 1)
+                    cos_step = np.cos(step)
+                    sin_step = np.sin(step)
+                    cos_d = cos_spread
+                    sin_d = sin_spread
+                i = num_branches
+                for link in range(children_offsets[node + 1] - 1, children_offsets[node] - 1, -1):
+                    child = children_flat[link]
+                    if placed[child]:
+                        continue
+                    i -= 1
+                    if start >= 0:
+                        stack_cos[top] = rotation_cos[start + i]
+                        stack_sin[top] = rotation_sin[start + i]
+                    else:
+                        stack_cos[top] = cos_d
+                        stack_sin[top] = sin_d
+                        cos_d, sin_d = (cos_d * cos_step + sin_d * sin_step,
+                                        sin_d * cos_step - cos_d * sin_step)
+                    stack_child[top] = child
+                    stack_parent[top] = node
+                    top += 1
+        
+        # Pop the next child that has not been positioned yet
+        node = -1
+        while top > 0:
+            top -= 1
+            if not placed[stack_child[top]]:
+                node = stack_child[top]
+                break
+        if node < 0:
+            break
+        
+        parent = stack_parent[top]
+        cos_a = dir_cos[parent] * stack_cos[top] - dir_sin[parent] * stack_sin[top]
+        sin_a = dir_sin[parent] * stack_cos[top] + dir_cos[parent] * stack_sin[top]
+        length = lengths[parent]
+        out_xy[node, 0] = out_xy[parent, 0] + length * cos_a
+        out_xy[node, 1] = out_xy[parent, 1] + length * sin_a
+        placed[node] = True
+        dir_cos[node] = cos_a
+        dir_sin[node] = sin_a
+        lengths[node] = length * length_factors[node]
+        depths[node] = depths[parent] + 1
+
+
+if njit is not None:
+    _place = njit(cache=True)(_place)
+
+# Ahead-of-time build of _place from aot_build.py, which needs no JIT warmup
+try:
+    from _tree_kernel import place as _place_aot
+except ImportError:  # Not built - JIT compile _place instead
+    _place_aot = None
+
+# Lower bound of the random length scaling of each branch (branch_factor is the upper)
+MIN_LENGTH_FACTOR = 0.8
+
+# Rotation of a single child's branch, which goes straight up
+_SINGLE_BRANCH_ROTATION = ((1.0,), (0.0,))
+
+# Cython build of _place for installs without Numba, compiled on first import. It is
+# only built when neither Numba kernel can be used, since it would never be called
+_place_cython = None
+if njit is None and _place_aot is None:
+    try:
+        import pyximport
+    except ImportError:  # Cython is optional - fall back to the pure-Python placement
+        pass
+    else:
+        _importers = pyximport.install(language_level=3)
+        try:
+            from _tree_core import place as _place_cython
+        except ImportError:  # No compiler available, or the build failed
+            pass
+        finally:
+            pyximport.uninstall(*_importers)
+
+# CUDA kernels behind TreeLayoutAlgorithm.layout_tree_gpu. Each thread handles one
+# node of the current level: count_children counts the unplaced children it will
+# spread, and expand_children writes their level entries starting at the node's
+# offset from the inclusive scan of those counts.
+_GPU_KERNEL_SOURCE = r"""
+extern "C" __global__
+void count_children(const int* level, const double* level_lengths, int level_size,
+                    const int* children_flat, const int* children_offsets,
+                    const bool* placed, double min_length, int* counts)
+{
+    int p = blockDim.x * blockIdx.x + threadIdx.x;
+    if (p >= level_size) return;
+    
+    int count = 0;
+    if (level_lengths[p] >= min_length) {
+        int node = level[p];
+        for (int link = children_offsets[node]; link < children_offsets[node + 1]; ++link) {
+            if (!placed[children_flat[link]]) ++count;
+        }
+    }
+    counts[p] = count;
+}
+
+extern "C" __global__
+void expand_children(const int* level, const double* level_x, const double* level_y,
+                     const double* level_cos, const double* level_sin,
+                     const double* level_lengths, int level_size,
+                     const int* children_flat, const int* children_offsets,
+                     const bool* placed, const int* counts, const int* ends,
+                     const double* rotation_cos, const double* rotation_sin,
+                     const int* rotation_start, int rotation_size, double branch_angle,
+                     const double* length_factors,
+                     int* next_level, double* next_x, double* next_y,
+                     double* next_cos, double* next_sin, double* next_lengths)
+{
+    int p = blockDim.x * blockIdx.x + threadIdx.x;
+    if (p >= level_size) return;
+    
+    int num_branches = counts[p];
+    if (!num_branches) return;
+    int out = ends[p] - num_branches;
+    int start = num_branches < rotation_size ? rotation_start[num_branches] : -1;
+    
+    int node = level[p];
+    double pc = level_cos[p], ps = level_sin[p], length = level_lengths[p];
+    int i = 0;
+    for (int link = children_offsets[node]; link < children_offsets[node + 1]; ++link) {
+        int child = children_flat[link];
+        if (placed[child]) continue;
+        
+        double cd, sd;
+        if (start >= 0) {
+            cd = rotation_cos[start + i];
+            sd = rotation_sin[start + i];
+        } else {
+            // Fanout 1 is always in the table, so num_branches > 1 here
+            double delta = ((double)i / (num_branches - 1)) * 2.0 * branch_angle - branch_angle;
+            sincos(delta, &sd, &cd);
+        }
+        
+        // Rotate the parent direction by the branch offset
+        double cos_a = pc * cd - ps * sd;
+        double sin_a = ps * cd + pc * sd;
+        next_level[out + i] = child;
+        next_x[out + i] = level_x[p] + length * cos_a;
+        next_y[out + i] = level_y[p] + length * sin_a;
+        next_cos[out + i] = cos_a;
+        next_sin[out + i] = sin_a;
+        next_lengths[out + i] = length * length_factors[child];
+        ++i;
+    }
+}
+"""
+
+# Threads per block for the level expansion kernels
+_GPU_BLOCK_SIZE = 128
+
+# CuPy and the compiled kernels, loaded on the first layout_tree_gpu call so that
+# CPU-only use never pays for importing CuPy
+_gpu = None
+
+
+def _get_gpu():
+    """
+    Get CuPy and the GPU kernel module, importing and compiling them on first use.
+    
+    Returns:
+        Tuple of (cupy module, cupy.RawModule with the level expansion kernels)
+        
+    Raises:
+        ImportError: If CuPy is not installed
+    """
+    global _gpu
+    
+    if _gpu is None:
+        try:
+            import cupy
+        except ImportError:  # CuPy is optional - only layout_tree_gpu needs it
+            raise ImportError("layout_tree_gpu requires CuPy (pip install cupy-cuda12x)") from None
+        _gpu = cupy, cupy.RawModule(code=_GPU_KERNEL_SOURCE)
+    return _gpu
 
 
 class TreeLayoutAlgorithm:
@@ -37,7 +297,8 @@ class TreeLayoutAlgorithm:
                  branch_angle: float = math.radians(35),
                  branch_factor: float = 0.85,
                  min_branch_length: float = 30.0,
-                 max_depth: int = 10000):
+                 max_depth: int = 10000,
+                 seed: Optional[int] = None):
         """
         Initialize the tree layout algorithm.
         
@@ -46,11 +307,18 @@ class TreeLayoutAlgorithm:
             branch_factor: Length scaling factor for child branches
             min_branch_length: Minimum length before stopping branch creation
             max_depth: Maximum recursion depth
+            seed: Seed for the random length variation, for reproducible layouts
         """
         self.branch_angle = branch_angle
         self.branch_factor = branch_factor
         self.min_branch_length = min_branch_length
         self.max_depth = max_depth
+        self.rng = np.random.default_rng(seed)
+        
+        # (cos, sin) of the branch angle offsets per fanout, valid for _delta_cache_angle.
+        # A single child goes straight up; priming it keeps the general case branch free.
+        self._delta_cache = {1: _SINGLE_BRANCH_ROTATION}
+        self._delta_cache_angle = branch_angle
         
         # Dynamic scaling parameters
         self.scaling_configs = {
@@ -60,6 +328,27 @@ class TreeLayoutAlgorithm:
             (61, float('inf')): {"base_length": 180, "base_spacing": 120}
         }
     
+    @property
+    def scaling_configs(self) -> Dict[Tuple[float, float], Dict[str, float]]:
+        """
+        Dynamic scaling parameters, keyed by inclusive (min_count, max_count) node ranges.
+        
+        Assigning new configs rebuilds the lookup table of calculate_dynamic_parameters.
+        Edits made to the dict in place are not tracked; assign it again to apply them.
+        """
+        return self._scaling_configs
+    
+    @scaling_configs.setter
+    def scaling_configs(self, configs: Dict[Tuple[float, float], Dict[str, float]]) -> None:
+        self._scaling_configs = configs
+        
+        # Bisect table: the upper bound of every range but the last, and the
+        # (base_length, base_spacing) of each range, in ascending order
+        ranges = sorted(configs.items())
+        self._scaling_thresholds = [max_count for (_, max_count), _ in ranges[:-1]]
+        self._scaling_values = [(config["base_length"], config["base_spacing"])
+                                for _, config in ranges]
+    
     def calculate_dynamic_parameters(self, node_count: int) -> Tuple[float, float]:
         """
         Calculate dynamic tree parameters based on node count.
@@ -70,13 +359,7 @@ class TreeLayoutAlgorithm:
         Returns:
             Tuple of (base_length, base_spacing)
         """
-        for (min_count, max_count), config in self.scaling_configs.items():
-            if min_count <= node_count <= max_count:
-                return config["base_length"], config["base_spacing"]
-        
-        # Fallback to largest configuration
-        return self.scaling_configs[(61, float('inf'))]["base_length"], \
-               self.scaling_configs[(61, float('inf'))]["base_spacing"]
+        return self._scaling_values[bisect.bisect_left(self._scaling_thresholds, node_count)]
     
     def build_tree_structure(self, root_node: str, nodes: Dict, links: List[Dict]) -> Dict[str, List[str]]:
         """
@@ -88,19 +371,17 @@ class TreeLayoutAlgorithm:
             links: List of link dictionaries with 'from' and 'to' keys
             
         Returns:
-            Dictionary mapping node IDs to their children
+            Dictionary mapping node IDs to their children (nodes without children
+            have no entry)
         """
-        tree_structure = {}
-        
-        # Initialize all nodes
-        for node_id in nodes.keys():
-            tree_structure[node_id] = []
+        tree_structure = defaultdict(list)
+        node_ids = nodes.keys()
         
         # Build parent-child relationships from links
         for link in links:
             parent = link.get('from')
             child = link.get('to')
-            if parent in tree_structure and child in tree_structure:
+            if parent in node_ids and child in node_ids:
                 tree_structure[parent].append(child)
         
         return tree_structure
@@ -116,14 +397,15 @@ class TreeLayoutAlgorithm:
         Returns:
             List of root node IDs
         """
-        all_node_ids = set(nodes.keys())
-        linked_to = set()
+        # Count incoming links per node in a single pass
+        indegree = dict.fromkeys(nodes, 0)
         
         for link in links:
-            if 'to' in link:
-                linked_to.add(link['to'])
+            target = link.get('to')
+            if target in indegree:
+                indegree[target] += 1
         
-        root_nodes = list(all_node_ids - linked_to)
+        root_nodes = [node_id for node_id, count in indegree.items() if count == 0]
         
         # If no clear roots, use first node as fallback
         if not root_nodes:
@@ -131,86 +413,259 @@ class TreeLayoutAlgorithm:
         
         return root_nodes
     
-    def place_nodes_recursively(self, 
-                               node_id: str,
-                               tree_structure: Dict[str, List[str]],
-                               start_x: float,
-                               start_y: float,
-                               angle: float,
-                               length: float,
-                               depth: int,
-                               positioned_nodes: Set[str],
-                               node_positions: Dict[str, Tuple[float, float]]) -> None:
+    def _get_delta_cache(self) -> Dict[int, Tuple[Tuple[float, ...], Tuple[float, ...]]]:
+        """
+        Get the per-fanout branch rotation cache, resetting it if branch_angle changed.
+        """
+        if self._delta_cache_angle != self.branch_angle:
+            self._delta_cache = {1: _SINGLE_BRANCH_ROTATION}
+            self._delta_cache_angle = self.branch_angle
+        return self._delta_cache
+    
+    def _branch_rotations(self, num_branches: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """
+        Compute and cache the rotation for each branch of a node with num_branches children.
+        
+        Args:
+            num_branches: Number of children of the node
+            
+        Returns:
+            Tuple of (cos_deltas, sin_deltas) for the branch angle offset of each child
+        """
+        # Spread branches evenly with configurable angle (a single child is primed in
+        # the cache, so num_branches > 1 here)
+        deltas = np.linspace(-self.branch_angle, self.branch_angle, num_branches)
+        
+        rotation = (tuple(np.cos(deltas).tolist()), tuple(np.sin(deltas).tolist()))
+        self._get_delta_cache()[num_branches] = rotation
+        return rotation
+    
+    def rotation_table(self, fanouts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Concatenate the cached branch rotations of the given fanouts into flat arrays.
+        
+        Args:
+            fanouts: Numbers of children to build rotations for
+            
+        Returns:
+            Tuple of (rotation_cos, rotation_sin, rotation_start), where the rotations of
+            a node with n children start at rotation_start[n] (-1 if n is not included;
+            a single child is always included)
         """
-        Recursively place nodes using tree reaction algorithm.
+        delta_cache = self._get_delta_cache()
         
-        This is the core of the algorithm - it places each node based on its parent's
-        position and angle, creating natural branch patterns.
+        table_cos = []
+        table_sin = []
+        table_start = np.full(max(int(fanouts.max(initial=0)), 1) + 1, -1, dtype=np.int32)
+        for num_branches in np.union1d(fanouts[fanouts > 0], [1]).tolist():
+            rotation = delta_cache.get(num_branches)
+            if rotation is None:
+                rotation = self._branch_rotations(num_branches)
+            table_start[num_branches] = len(table_cos)
+            table_cos.extend(rotation[0])
+            table_sin.extend(rotation[1])
+        
+        return (np.asarray(table_cos, dtype=np.float64),
+                np.asarray(table_sin, dtype=np.float64),
+                table_start)
+    
+    def flatten_tree_structure(self,
+                               node_ids: List[str],
+                               tree_structure: Dict[str, List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flatten tree structure into CSR (compressed sparse row) arrays.
         
         Args:
-            node_id: Current node being positioned
+            node_ids: All node IDs; a node's index in this list is its integer ID
             tree_structure: Dictionary mapping nodes to their children
-            start_x, start_y: Starting position for this branch
-            angle: Current branch angle
-            length: Current branch length
-            depth: Current recursion depth
-            positioned_nodes: Set of already positioned nodes
-            node_positions: Dictionary to store final node positions
+            
+        Returns:
+            Tuple of (children_flat, children_offsets) int32 arrays, where the children
+            of node i are children_flat[children_offsets[i]:children_offsets[i + 1]]
         """
-        # Stop if we've reached max depth or minimum length
-        if depth >= self.max_depth or length < self.min_branch_length:
-            return
+        id_to_idx = {node_id: i for i, node_id in enumerate(node_ids)}
+        children_lists = [[id_to_idx[child] for child in tree_structure.get(node_id, [])]
+                          for node_id in node_ids]
         
-        # Get children for this node
-        children = tree_structure.get(node_id, [])
+        children_offsets = np.zeros(len(node_ids) + 1, dtype=np.int32)
+        np.cumsum([len(children) for children in children_lists], out=children_offsets[1:])
+        children_flat = np.fromiter(
+            (child for children in children_lists for child in children),
+            dtype=np.int32, count=int(children_offsets[-1])
+        )
         
-        if not children:
-            return  # No children, end of branch
+        return children_flat, children_offsets
+    
+    def place_all(self,
+                  children_flat: List[int],
+                  children_offsets: List[int],
+                  root_idx: int,
+                  root_x: float,
+                  root_y: float,
+                  base_length: float,
+                  length_factors: List[float],
+                  xy: np.ndarray,
+                  placed: np.ndarray) -> None:
+        """
+        Place all descendants of a root node depth-first using an explicit stack.
         
-        # Calculate number of branches (children)
-        num_branches = len(children)
+        Visits nodes in the same preorder as the original recursive placement without
+        paying a Python call per node or hitting the recursion limit on deep trees.
+        Nodes are identified by their index in the CSR-flattened tree.
         
-        # Place each child node
-        for i, child_id in enumerate(children):
-            # Skip if already positioned
-            if child_id in positioned_nodes:
-                continue
+        Args:
+            children_flat: Child indices of every node, concatenated
+            children_offsets: Start of each node's children in children_flat (N + 1)
+            root_idx: Index of the root node
+            root_x, root_y: Position of the root node
+            base_length: Branch length from the root to its children
+            length_factors: Pre-drawn random length scaling for each node
+            xy: (N, 2) float64 array receiving node positions
+            placed: (N,) bool array marking positioned nodes
+        """
+        # Work on Python lists, which index much faster than arrays element by element,
+        # and copy the results back once at the end
+        xs = xy[:, 0].tolist()
+        ys = xy[:, 1].tolist()
+        positioned = placed.tolist()
+        
+        # Bind attributes and methods used per node to locals
+        max_depth = self.max_depth
+        min_length = self.min_branch_length
+        delta_cache = self._get_delta_cache()
+        branch_rotations = self._branch_rotations
+        
+        # Rotations of the outer branches, shared by binary and ternary fanouts (the
+        # same values as their cached rotations)
+        cos_spread = float(np.cos(self.branch_angle))
+        sin_spread = float(np.sin(self.branch_angle))
+        
+        # Each frame is (child, x, y, cos_a, sin_a, length, depth, cos_d, sin_d): the child
+        # to place, the state of its parent and the rotation of the child's branch
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        node, x, y, cos_a, sin_a, length, depth = root_idx, root_x, root_y, 0.0, -1.0, base_length, 1
+        
+        while True:
+            # Push the unplaced children of the node placed last, in reverse for preorder.
+            # Already placed children are dropped before spreading the branches so the
+            # remaining ones are spread evenly.
+            if depth < max_depth and length >= min_length:
+                first, end = children_offsets[node], children_offsets[node + 1]
+                children = [child for child in children_flat[first:end] if not positioned[child]]
+                num_branches = len(children)
+                if num_branches == 2:
+                    # Binary and ternary fanouts are the most common, so their branch
+                    # rotations are unrolled
+                    push((children[1], x, y, cos_a, sin_a, length, depth, cos_spread, sin_spread))
+                    push((children[0], x, y, cos_a, sin_a, length, depth, cos_spread, -sin_spread))
+                elif num_branches == 3:
+                    push((children[2], x, y, cos_a, sin_a, length, depth, cos_spread, sin_spread))
+                    push((children[1], x, y, cos_a, sin_a, length, depth, 1.0, 0.0))
+                    push((children[0], x, y, cos_a, sin_a, length, depth, cos_spread, -sin_spread))
+                elif num_branches:
+                    rotation = delta_cache.get(num_branches)
+                    if rotation is None:
+                        rotation = branch_rotations(num_branches)
+                    cos_deltas, sin_deltas = rotation
+                    for i in range(num_branches - 1, -1, -1):
+                        push((children[i], x, y, cos_a, sin_a, length, depth,
+                              cos_deltas[i], sin_deltas[i]))
             
-            # Calculate angle for this branch
-            if num_branches == 1:
-                delta = 0  # Single child goes straight up
+            # Pop the next child that has not been positioned yet (it may have been
+            # reached through another parent since it was pushed)
+            while stack:
+                node, x, y, cos_a, sin_a, length, depth, cos_d, sin_d = pop()
+                if not positioned[node]:
+                    break
             else:
-                # Spread branches evenly with configurable angle
-                spread = self.branch_angle * 2
-                delta = (i / (num_branches - 1)) * spread - spread / 2
+                break
             
-            child_angle = angle + delta
-            
-            # Calculate position using trigonometry
-            end_x = start_x + length * math.cos(child_angle)
-            end_y = start_y + length * math.sin(child_angle)
-            
-            # Store the child's position
-            node_positions[child_id] = (end_x, end_y)
-            positioned_nodes.add(child_id)
+            cos_a, sin_a = cos_a * cos_d - sin_a * sin_d, sin_a * cos_d + cos_a * sin_d
+            x += length * cos_a
+            y += length * sin_a
+            xs[node] = x
+            ys[node] = y
+            positioned[node] = True
             
             # Calculate new length (shorter for next level with random variation)
-            new_length = length * random.uniform(0.8, self.branch_factor)
+            length *= length_factors[node]
+            depth += 1
+        
+        xy[:, 0] = xs
+        xy[:, 1] = ys
+        placed[:] = positioned
+    
+    def layout_tree_arrays(self, 
+                           nodes: Dict, 
+                           links: List[Dict], 
+                           root_x: float = 600, 
+                           root_y: float = 650) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Layout a tree structure and return the positions as arrays.
+        
+        Args:
+            nodes: Dictionary of all nodes (format: {node_id: node_data})
+            links: List of link dictionaries (format: [{'from': 'node1', 'to': 'node2'}])
+            root_x, root_y: Position for the root node
+            
+        Returns:
+            Tuple of (ids, xy) where ids is an object array of the placed node IDs
+            and xy is a float64 array of shape (len(ids), 2) with their positions
+        """
+        if not nodes:
+            return np.empty(0, dtype=object), np.empty((0, 2), dtype=np.float64)
+        
+        total_nodes = len(nodes)
+        node_ids, children_flat, children_offsets, root_idx, base_length, length_factors = \
+            self._prepare_layout(nodes, links)
+        
+        # Positions and placement state by node index
+        xy = np.zeros((total_nodes, 2), dtype=np.float64)
+        placed = np.zeros(total_nodes, dtype=np.bool_)
+        
+        if _place_aot is not None or njit is not None or _place_cython is not None:
+            rotation_cos, rotation_sin, rotation_start = self.rotation_table(np.diff(children_offsets))
+            if _place_aot is not None or njit is not None:
+                place = _place_aot if _place_aot is not None else _place
+                place(children_flat, children_offsets, rotation_cos, rotation_sin, rotation_start,
+                      float(self.branch_angle), root_idx, float(root_x), float(root_y),
+                      float(base_length), length_factors, float(self.min_branch_length),
+                      int(self.max_depth), xy, placed)
+            else:
+                _place_cython(children_flat, children_offsets, rotation_cos, rotation_sin,
+                              rotation_start, float(self.branch_angle), root_idx, float(root_x),
+                              float(root_y), float(base_length), length_factors,
+                              float(self.min_branch_length), int(self.max_depth), xy,
+                              placed.view(np.uint8))
+        else:
+            # Place root node
+            xy[root_idx] = (root_x, root_y)
+            placed[root_idx] = True
             
-            # Recursively place children of this child
-            self.place_nodes_recursively(
-                child_id, tree_structure, end_x, end_y,
-                child_angle, new_length, depth + 1,
-                positioned_nodes, node_positions
-            )
+            # Place all other nodes depth-first
+            self.place_all(children_flat.tolist(), children_offsets.tolist(), root_idx,
+                           root_x, root_y, base_length, length_factors.tolist(), xy, placed)
+        
+        return self._placed_arrays(node_ids, xy, placed)
     
-    def layout_tree(self, 
-                   nodes: Dict, 
-                   links: List[Dict], 
-                   root_x: float = 600, 
-                   root_y: float = 650) -> Dict[str, Tuple[float, float]]:
+    def layout_tree_gpu(self, 
+                        nodes: Dict, 
+                        links: List[Dict], 
+                        root_x: float = 600, 
+                        root_y: float = 650) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Main method to layout a tree structure.
+        Layout a tree structure on a CUDA GPU and return the positions as arrays.
+        
+        Every node on a level is expanded by its own GPU thread, so this pays off
+        for large trees (roughly 50k nodes and up) where levels are wide. The
+        random length variation is drawn on the CPU exactly as in
+        layout_tree_arrays, so for trees both give the same layout for the same
+        seed up to floating-point rounding. In graphs where a node is reachable
+        from several parents, it is positioned from the first one reached level
+        by level rather than depth-first. Requires CuPy, which is imported on the
+        first call. Experimental: this path has not yet been run on a GPU.
         
         Args:
             nodes: Dictionary of all nodes (format: {node_id: node_data})
@@ -218,11 +673,103 @@ class TreeLayoutAlgorithm:
             root_x, root_y: Position for the root node
             
         Returns:
-            Dictionary mapping node IDs to (x, y) positions
+            Tuple of (ids, xy) as returned by layout_tree_arrays
         """
+        cp, gpu_module = _get_gpu()
         if not nodes:
-            return {}
+            return np.empty(0, dtype=object), np.empty((0, 2), dtype=np.float64)
         
+        total_nodes = len(nodes)
+        node_ids, children_flat, children_offsets, root_idx, base_length, length_factors = \
+            self._prepare_layout(nodes, links)
+        rotation_cos, rotation_sin, rotation_start = self.rotation_table(np.diff(children_offsets))
+        count_children = gpu_module.get_function('count_children')
+        expand_children = gpu_module.get_function('expand_children')
+        
+        # Move the flattened tree and per-node state to the device
+        d_children_flat = cp.asarray(children_flat)
+        d_children_offsets = cp.asarray(children_offsets)
+        d_rotation_cos = cp.asarray(rotation_cos)
+        d_rotation_sin = cp.asarray(rotation_sin)
+        d_rotation_start = cp.asarray(rotation_start)
+        d_length_factors = cp.asarray(length_factors)
+        xy = cp.zeros((total_nodes, 2), dtype=cp.float64)
+        placed = cp.zeros(total_nodes, dtype=cp.bool_)
+        xy[root_idx, 0] = root_x
+        xy[root_idx, 1] = root_y
+        placed[root_idx] = True
+        
+        # State of the nodes on the current level, where (cos_a, sin_a) is the direction
+        # of the branch ending at the node
+        level = cp.array([root_idx], dtype=cp.int32)
+        level_x = cp.array([root_x], dtype=cp.float64)
+        level_y = cp.array([root_y], dtype=cp.float64)
+        level_cos = cp.array([0.0])  # Start pointing upward
+        level_sin = cp.array([-1.0])
+        level_lengths = cp.array([base_length], dtype=cp.float64)
+        depth = 1
+        
+        while level.size and depth < self.max_depth:
+            level_size = level.size
+            blocks = ((level_size + _GPU_BLOCK_SIZE - 1) // _GPU_BLOCK_SIZE,)
+            
+            # Write offsets of each node's children from a scan of their counts
+            counts = cp.empty(level_size, dtype=cp.int32)
+            count_children(blocks, (_GPU_BLOCK_SIZE,), (
+                level, level_lengths, np.int32(level_size), d_children_flat,
+                d_children_offsets, placed, np.float64(self.min_branch_length), counts))
+            ends = cp.cumsum(counts, dtype=cp.int32)
+            total = int(ends[-1])
+            if not total:
+                break
+            
+            next_level = cp.empty(total, dtype=cp.int32)
+            next_x, next_y, next_cos, next_sin, next_lengths = (
+                cp.empty(total, dtype=cp.float64) for _ in range(5))
+            expand_children(blocks, (_GPU_BLOCK_SIZE,), (
+                level, level_x, level_y, level_cos, level_sin, level_lengths,
+                np.int32(level_size), d_children_flat, d_children_offsets, placed, counts,
+                ends, d_rotation_cos, d_rotation_sin, d_rotation_start,
+                np.int32(rotation_start.size), np.float64(self.branch_angle),
+                d_length_factors, next_level, next_x, next_y, next_cos, next_sin,
+                next_lengths))
+            
+            # Keep the first entry of children reached from several parents
+            first = cp.unique(next_level, return_index=True)[1]
+            if first.size < total:
+                first.sort()
+                next_level, next_x, next_y, next_cos, next_sin, next_lengths = (
+                    values[first] for values in
+                    (next_level, next_x, next_y, next_cos, next_sin, next_lengths))
+            
+            xy[next_level, 0] = next_x
+            xy[next_level, 1] = next_y
+            placed[next_level] = True
+            
+            level = next_level
+            level_x = next_x
+            level_y = next_y
+            level_cos = next_cos
+            level_sin = next_sin
+            level_lengths = next_lengths
+            depth += 1
+        
+        return self._placed_arrays(node_ids, cp.asnumpy(xy), cp.asnumpy(placed))
+    
+    def _prepare_layout(self, 
+                        nodes: Dict, 
+                        links: List[Dict]) -> Tuple[List, np.ndarray, np.ndarray, int, float, np.ndarray]:
+        """
+        Flatten the tree and draw the per-node inputs shared by the layout methods.
+        
+        Args:
+            nodes: Dictionary of all nodes (format: {node_id: node_data})
+            links: List of link dictionaries (format: [{'from': 'node1', 'to': 'node2'}])
+            
+        Returns:
+            Tuple of (node_ids, children_flat, children_offsets, root_idx, base_length,
+            length_factors)
+        """
         # Calculate dynamic parameters based on node count
         total_nodes = len(nodes)
         base_length, base_spacing = self.calculate_dynamic_parameters(total_nodes)
@@ -233,25 +780,59 @@ class TreeLayoutAlgorithm:
         # If multiple roots, use the first one (could be enhanced to handle multiple roots)
         root_node = root_nodes[0]
         
-        # Build tree structure from links
+        # Build tree structure from links and flatten it to integer node indices
         tree_structure = self.build_tree_structure(root_node, nodes, links)
+        node_ids = list(nodes.keys())
+        children_flat, children_offsets = self.flatten_tree_structure(node_ids, tree_structure)
+        root_idx = node_ids.index(root_node)
         
-        # Initialize position tracking
-        node_positions = {}
-        positioned_nodes = set()
+        # Draw the random length variation for every node in one call, scaling
+        # [0, 1) samples into [0.8, branch_factor) in place
+        length_factors = self.rng.random(total_nodes)
+        length_factors *= self.branch_factor - MIN_LENGTH_FACTOR
+        length_factors += MIN_LENGTH_FACTOR
         
-        # Place root node
-        node_positions[root_node] = (root_x, root_y)
-        positioned_nodes.add(root_node)
+        return node_ids, children_flat, children_offsets, root_idx, base_length, length_factors
+    
+    def _placed_arrays(self, 
+                       node_ids: List, 
+                       xy: np.ndarray, 
+                       placed: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select the IDs and positions of the placed nodes.
         
-        # Recursively place all other nodes
-        self.place_nodes_recursively(
-            root_node, tree_structure, root_x, root_y,
-            -math.pi / 2,  # Start pointing upward
-            base_length, 1, positioned_nodes, node_positions
-        )
+        Args:
+            node_ids: All node IDs, in index order
+            xy: (N, 2) array of node positions
+            placed: (N,) bool array marking positioned nodes
+            
+        Returns:
+            Tuple of (ids, xy) for the placed nodes
+        """
+        # Node IDs keep their original Python objects so they round-trip exactly
+        ids = np.empty(len(node_ids), dtype=object)
+        ids[:] = node_ids
+        placed_idx = np.flatnonzero(placed)
+        return ids[placed_idx], xy[placed_idx]
+    
+    def layout_tree(self, 
+                   nodes: Dict, 
+                   links: List[Dict], 
+                   root_x: float = 600, 
+                   root_y: float = 650) -> Dict[str, Tuple[float, float]]:
+        """
+        Main method to layout a tree structure.
         
-        return node_positions
+        Args:
+            nodes: Dictionary of all nodes (format: {node_id: node_data})
+            links: List of link dictionaries (format: [{'from': 'node1', 'to': 'node2'}])
+            root_x, root_y: Position for the root node
+            
+        Returns:
+            Dictionary mapping node IDs to (x, y) positions
+        """
+        ids, xy = self.layout_tree_arrays(nodes, links, root_x, root_y)
+        return {node_id: (x, y) for node_id, (x, y) in zip(ids.tolist(), xy.tolist())}
 
 
 # Example usage and testing
@@ -0,0 +1,38 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython build of the tree reaction simulation's per-frame growth step.
+
+Grows the live branches of an ArenaTree (see tree_reaction_simulation.py) in a
+single C loop. Built on import through pyximport when Cython is installed.
+"""
+
+
+cpdef void step(const Py_ssize_t[::1] indices,
+                float[::1] length,
+                const float[::1] target_length,
+                const float[::1] start_x,
+                const float[::1] start_y,
+                const float[::1] cos_a,
+                const float[::1] sin_a,
+                float[::1] end_x,
+                float[::1] end_y,
+                float growth_speed) noexcept nogil:
+    """
+    Grow the selected branches by growth_speed, clamped to their target length,
+    and move their end points. Fully grown branches are left untouched.
+
+    See ArenaTree.grow_all in tree_reaction_simulation.py for the arrays.
+    """
+    cdef Py_ssize_t k, i
+    cdef float new_length
+
+    for k in range(indices.shape[0]):
+        i = indices[k]
+        if length[i] >= target_length[i]:
+            continue
+        new_length = length[i] + growth_speed
+        if new_length > target_length[i]:
+            new_length = target_length[i]
+        length[i] = new_length
+        end_x[i] = start_x[i] + new_length * cos_a[i]
+        end_y[i] = start_y[i] + new_length * sin_a[i]
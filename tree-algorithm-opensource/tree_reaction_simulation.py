@@ -23,8 +23,33 @@ practical tree layout algorithm for PathForge.
 
 import pygame
 import sys
+import os
+import atexit
+import signal
 import math
-import random
+import multiprocessing
+from dataclasses import dataclass, field
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to growing branches in Python
+    njit = None
+
+# Cython build of the per-frame growth step, compiled on first import
+try:
+    import pyximport
+except ImportError:  # Cython is optional - fall back to the NumPy growth step
+    _step_cython = None
+else:
+    _importers = pyximport.install(language_level=3)
+    try:
+        from tree_reaction_core import step as _step_cython
+    except ImportError:  # No compiler available, or the build failed
+        _step_cython = None
+    finally:
+        pyximport.uninstall(*_importers)
 
 # Initialize pygame
 pygame.init()
@@ -50,6 +75,20 @@ BUTTON1_X = WIDTH // 2 - 60  # Left side of center
 BUTTON2_X = WIDTH // 2       # Center
 BUTTON3_X = WIDTH // 2 + 60  # Right side of center
 BUTTON_Y = 30
+UI_RECT = pygame.Rect(0, 0, WIDTH, BUTTON_Y + 50)  # Buttons and instructions
+
+# UI text, rendered once instead of every frame
+BUTTON_FONT = pygame.font.Font(None, 16)
+BUTTON_FONT.set_bold(True)
+BUTTON_TEXT = {}  # Rendered button labels by text, filled on first draw
+INSTRUCTION_FONT = pygame.font.Font(None, 20)
+INSTRUCTION_SURFACES = [INSTRUCTION_FONT.render(instruction, True, (255, 255, 255))
+                        for instruction in ("1 = Instant growth", "2 = Tree Color", "3 = Slow Growth")]
+SPACEBAR_SURFACE = pygame.font.Font(None, 18).render("SPACEBAR = Update Color", True, (255, 255, 255))
+
+# Frame rates while a tree is animating and while the screen is idle
+ACTIVE_FPS = 60
+IDLE_FPS = 15
 
 # Color schemes for the tree (32 different colors)
 COLOR_SCHEMES = [
@@ -87,242 +126,629 @@ COLOR_SCHEMES = [
     "cyan"        # Bright cyan
 ]
 
-# Create static surface for performance optimization
-static_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+# Create static surface for performance optimization. It is opaque and holds the
+# background too, so it is copied to the screen without blending or clearing first
+BACKGROUND_COLOR = (10, 10, 30)
+static_surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+static_surface.fill(BACKGROUND_COLOR)
+
+# Worker processes for instant growth, started on first use
+_instant_grow_pool = None
+
+# Random samples for child creation, drawn in bulk from a NumPy generator. Each
+# spawn uses a branch count and up to 3 angle offsets and length factors; a pool
+# covers SAMPLE_POOL_SIZE spawns, about as many as a full tree needs.
+SAMPLE_POOL_SIZE = 1 << 12
+_rng = np.random.default_rng()
+_count_pool = []
+_delta_pool = []
+_factor_pool = []
+_pool_idx = SAMPLE_POOL_SIZE
 
 
-class Branch:
+def seed_samples(seed=None) -> None:
     """
-    Represents a single branch in the tree.
+    Reseed the random samples used for child creation.
     
-    Each branch can grow over time and spawn child branches when it reaches
-    its target length, creating a recursive tree structure.
+    Args:
+        seed: Seed for the NumPy generator, or None for fresh entropy
+    """
+    global _rng, _pool_idx
+    _rng = np.random.default_rng(seed)
+    _pool_idx = SAMPLE_POOL_SIZE  # Refill on next use
+
+
+def _next_samples() -> tuple:
+    """
+    Take the random samples for one spawn, refilling the pools when used up.
+    
+    Returns:
+        Tuple of (num_branches, deltas, length_factors)
     """
+    global _count_pool, _delta_pool, _factor_pool, _pool_idx
+    if _pool_idx == SAMPLE_POOL_SIZE:
+        _count_pool = _rng.integers(2, 4, size=SAMPLE_POOL_SIZE).tolist()
+        _delta_pool = _rng.uniform(-BRANCH_ANGLE, BRANCH_ANGLE, size=3 * SAMPLE_POOL_SIZE).tolist()
+        _factor_pool = _rng.uniform(0.8, BRANCH_FACTOR, size=3 * SAMPLE_POOL_SIZE).tolist()
+        _pool_idx = 0
     
-    def __init__(self, start: tuple, angle: float, length: float, depth: int):
+    num_branches = _count_pool[_pool_idx]
+    first = 3 * _pool_idx
+    _pool_idx += 1
+    return (num_branches, _delta_pool[first:first + num_branches],
+            _factor_pool[first:first + num_branches])
+
+
+# Per-branch arrays of ArenaTree
+ARENA_ARRAYS = ('start_x', 'start_y', 'angle', 'cos_a', 'sin_a', 'length',
+                'target_length', 'end_x', 'end_y', 'depth', 'parent_idx', 'flags',
+                'unstatic_children')
+
+# Branch state flags
+FINISHED = 1  # Branch has reached its target length and spawned its children
+STATIC = 2    # Branch and all its descendants are fully grown and drawn to static_surface
+
+
+@dataclass
+class ArenaTree:
+    """
+    Tree of branches stored as parallel NumPy arrays (structure of arrays).
+    
+    Branch i is described by entry i of every array, so per-frame growth and
+    bookkeeping run as vectorized passes instead of walking Python objects.
+    Only the first `size` entries are in use; the arrays double in capacity
+    when full. Per-frame work only visits the live (not yet static) branches.
+    """
+    capacity: int = 1024
+    size: int = 0
+    leaf_count: int = 0                             # Branch ends, kept up to date on spawn
+    start_x: np.ndarray = field(init=False)
+    start_y: np.ndarray = field(init=False)
+    angle: np.ndarray = field(init=False)
+    cos_a: np.ndarray = field(init=False)           # cos/sin of the angle, which never
+    sin_a: np.ndarray = field(init=False)           # changes after creation
+    length: np.ndarray = field(init=False)          # Current length (grows over time)
+    target_length: np.ndarray = field(init=False)   # Final target length
+    end_x: np.ndarray = field(init=False)           # End position, updated only while
+    end_y: np.ndarray = field(init=False)           # the branch grows
+    depth: np.ndarray = field(init=False)
+    parent_idx: np.ndarray = field(init=False)      # -1 for the root
+    flags: np.ndarray = field(init=False)           # FINISHED / STATIC bits
+    unstatic_children: np.ndarray = field(init=False)  # Children not static yet
+    live: np.ndarray = field(init=False)            # Live branches added before live_end
+    live_end: int = field(init=False)
+    
+    def __post_init__(self):
+        self._allocate()
+        self.live = np.arange(self.size)
+        self.live_end = self.size
+    
+    def _allocate(self) -> None:
         """
-        Initialize a new branch.
-        
-        Args:
-            start: Starting position (x, y)
-            angle: Branch angle in radians
-            length: Target length for this branch
-            depth: Current depth in the tree (affects color and thickness)
+        Allocate every per-branch array at the current capacity.
         """
-        self.start = start
-        self.angle = angle
-        self.length = 0                    # Current length (grows over time)
-        self.target_length = length        # Final target length
-        self.depth = depth
-        self.finished = False              # Has this branch finished growing?
-        self.children = []                 # Child branches
-        self.static = False                # Is this branch fully grown and static?
-    
-    def grow(self) -> None:
+        self.start_x = np.empty(self.capacity, dtype=np.float32)
+        self.start_y = np.empty(self.capacity, dtype=np.float32)
+        self.angle = np.empty(self.capacity, dtype=np.float32)
+        self.cos_a = np.empty(self.capacity, dtype=np.float32)
+        self.sin_a = np.empty(self.capacity, dtype=np.float32)
+        self.length = np.zeros(self.capacity, dtype=np.float32)
+        self.target_length = np.empty(self.capacity, dtype=np.float32)
+        self.end_x = np.empty(self.capacity, dtype=np.float32)
+        self.end_y = np.empty(self.capacity, dtype=np.float32)
+        self.depth = np.empty(self.capacity, dtype=np.int32)
+        self.parent_idx = np.full(self.capacity, -1, dtype=np.int32)
+        self.flags = np.zeros(self.capacity, dtype=np.uint8)
+        self.unstatic_children = np.zeros(self.capacity, dtype=np.int32)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _grow_capacity(self) -> None:
         """
-        Grow this branch and potentially create children.
-        
-        This is the core of the tree reaction algorithm - each branch grows
-        over time and spawns new branches when it reaches its target length.
+        Double the capacity of every array, keeping the branches in use.
         """
-        # Grow the branch length
-        if self.length < self.target_length:
-            self.length += GROWTH_SPEED
-            if self.length > self.target_length:
-                self.length = self.target_length
-        else:
-            # Branch has reached target length - create children
-            if (not self.finished and 
-                self.depth < MAX_DEPTH and 
-                self.target_length > MIN_BRANCH_LENGTH):
-                
-                self.finished = True
-                end = self.get_end()
-                
-                # Create 2-3 child branches (random for natural variation)
-                num_branches = random.choice([2, 3])
-                
-                for _ in range(num_branches):
-                    # Calculate branch angle
-                    if self.depth == 1:
-                        delta = 0  # First level branches go straight up
-                    else:
-                        # Random angle variation within the branch spread
-                        delta = random.uniform(-BRANCH_ANGLE, BRANCH_ANGLE)
-                    
-                    # Calculate new branch length with random variation
-                    new_length = self.target_length * random.uniform(0.8, BRANCH_FACTOR)
-                    
-                    # Only create branch if it's long enough
-                    if new_length >= MIN_BRANCH_LENGTH:
-                        child = Branch(
-                            end,                           # Start from end of current branch
-                            self.angle + delta,           # New angle
-                            new_length,                   # New length
-                            self.depth + 1                # Deeper in tree
-                        )
-                        self.children.append(child)
-            
-            # Mark as static if finished and all children are static
-            if self.finished and all(child.static for child in self.children):
-                self.static = True
-                self.draw_static(static_surface)
+        old = {name: getattr(self, name) for name in ARENA_ARRAYS}
+        self.capacity *= 2
+        self._allocate()
+        for name, values in old.items():
+            getattr(self, name)[:self.size] = values[:self.size]
     
-    def get_end(self) -> tuple:
+    def add_branch(self, start_x: float, start_y: float, angle: float, length: float,
+                   depth: int, parent_idx: int = -1) -> int:
         """
-        Calculate the end position of this branch using trigonometry.
+        Append a new branch with zero current length.
         
+        Args:
+            start_x, start_y: Starting position
+            angle: Branch angle in radians
+            length: Target length for this branch
+            depth: Current depth in the tree (affects color and thickness)
+            parent_idx: Index of the parent branch, or -1 for a root
+            
         Returns:
-            Tuple of (x, y) coordinates for the branch end
+            Index of the new branch
         """
-        dx = self.length * math.cos(self.angle)
-        dy = self.length * math.sin(self.angle)
-        return (self.start[0] + dx, self.start[1] + dy)
+        if self.size == self.capacity:
+            self._grow_capacity()
+        
+        i = self.size
+        self.start_x[i] = start_x
+        self.start_y[i] = start_y
+        self.angle[i] = angle
+        self.cos_a[i] = math.cos(angle)
+        self.sin_a[i] = math.sin(angle)
+        self.length[i] = 0
+        self.target_length[i] = length
+        self.end_x[i] = start_x
+        self.end_y[i] = start_y
+        self.depth[i] = depth
+        self.parent_idx[i] = parent_idx
+        self.unstatic_children[i] = 0
+        if parent_idx >= 0:
+            self.unstatic_children[parent_idx] += 1
+        self.flags[i] = 0
+        self.size += 1
+        self.leaf_count += 1
+        return i
     
-    def get_color(self, color_scheme: str) -> tuple:
+    def spawn_children(self, i: int, end_x: float, end_y: float) -> list:
         """
-        Get color for this branch based on depth and color scheme.
+        Create the child branches of a branch that reached its target length.
         
         Args:
-            color_scheme: Current color scheme name
+            i: Index of the parent branch
+            end_x, end_y: End position of the parent branch
             
         Returns:
-            RGB color tuple
+            Indices of the new child branches
         """
-        depth_factor = min(self.depth * 15, 200)
-        
-        if color_scheme == "green":
-            return (0, 255 - depth_factor, 0)
-        elif color_scheme == "autumn":
-            return (255 - depth_factor, 100 + depth_factor // 2, 0)
-        elif color_scheme == "winter":
-            return (200 - depth_factor, 200 - depth_factor, 255 - depth_factor)
-        elif color_scheme == "spring":
-            return (255 - depth_factor, 100 + depth_factor // 2, 200 - depth_factor)
-        elif color_scheme == "summer":
-            return (255 - depth_factor, 255 - depth_factor // 2, 0)
-        elif color_scheme == "fire":
-            return (255, 100 + depth_factor // 2, 0)
-        elif color_scheme == "ocean":
-            return (0, 150 + depth_factor // 2, 255 - depth_factor)
-        elif color_scheme == "sunset":
-            return (255 - depth_factor, 50 + depth_factor // 2, 150 + depth_factor // 2)
-        elif color_scheme == "forest":
-            return (0, 150 - depth_factor // 2, 0)
-        elif color_scheme == "desert":
-            return (200 - depth_factor // 2, 150 - depth_factor // 3, 50)
-        elif color_scheme == "arctic":
-            return (180 - depth_factor, 200 - depth_factor, 255 - depth_factor // 2)
-        elif color_scheme == "tropical":
-            return (255 - depth_factor, 100 + depth_factor, 0)
-        elif color_scheme == "mountain":
-            return (150 - depth_factor, 150 - depth_factor, 160 - depth_factor)
-        elif color_scheme == "sunrise":
-            return (255 - depth_factor // 2, 200 - depth_factor // 2, 0)
-        elif color_scheme == "midnight":
-            return (50 + depth_factor // 2, 0, 100 + depth_factor // 2)
-        elif color_scheme == "lavender":
-            return (200 - depth_factor, 150 - depth_factor // 2, 255 - depth_factor)
-        elif color_scheme == "coral":
-            return (255 - depth_factor, 100 - depth_factor // 2, 100 - depth_factor // 2)
-        elif color_scheme == "emerald":
-            return (0, 200 - depth_factor // 2, 100 - depth_factor // 3)
-        elif color_scheme == "amber":
-            return (255 - depth_factor // 2, 200 - depth_factor // 2, 0)
-        elif color_scheme == "crimson":
-            return (200 - depth_factor // 2, 0, 0)
-        elif color_scheme == "azure":
-            return (0, 150 - depth_factor // 2, 255 - depth_factor)
-        elif color_scheme == "violet":
-            return (150 - depth_factor // 2, 0, 200 - depth_factor // 2)
-        elif color_scheme == "copper":
-            return (200 - depth_factor // 2, 100 - depth_factor // 3, 50)
-        elif color_scheme == "silver":
-            return (180 - depth_factor, 180 - depth_factor, 180 - depth_factor)
-        elif color_scheme == "gold":
-            return (255 - depth_factor // 2, 215 - depth_factor // 2, 0)
-        elif color_scheme == "rose":
-            return (255 - depth_factor, 100 - depth_factor // 2, 150 - depth_factor // 2)
-        elif color_scheme == "teal":
-            return (0, 150 - depth_factor // 2, 150 - depth_factor // 2)
-        elif color_scheme == "maroon":
-            return (150 - depth_factor // 2, 0, 0)
-        elif color_scheme == "navy":
-            return (0, 0, 150 - depth_factor // 2)
-        elif color_scheme == "lime":
-            return (150 - depth_factor // 2, 255 - depth_factor, 0)
-        elif color_scheme == "magenta":
-            return (255 - depth_factor, 0, 255 - depth_factor)
-        elif color_scheme == "cyan":
-            return (0, 255 - depth_factor, 255 - depth_factor)
-        else:
-            return (0, 255 - depth_factor, 0)  # Default green
+        self.flags[i] |= FINISHED
+        angle = float(self.angle[i])
+        target_length = float(self.target_length[i])
+        depth = int(self.depth[i])
+        
+        # Create 2-3 child branches (random for natural variation)
+        num_branches, deltas, length_factors = _next_samples()
+        
+        children = []
+        for b in range(num_branches):
+            # Calculate branch angle
+            if depth == 1:
+                delta = 0  # First level branches go straight up
+            else:
+                # Random angle variation within the branch spread
+                delta = deltas[b]
+            
+            # Calculate new branch length with random variation
+            new_length = target_length * length_factors[b]
+            
+            # Only create branch if it's long enough
+            if new_length >= MIN_BRANCH_LENGTH:
+                children.append(self.add_branch(end_x, end_y, angle + delta, new_length, depth + 1, i))
+        
+        # The parent stops being a branch end once it has children
+        if children:
+            self.leaf_count -= 1
+        return children
     
-    def draw(self, surface: pygame.Surface, color_scheme: str = "green") -> None:
+    def merge_subtree(self, root: int, rows: dict, leaf_count: int) -> None:
         """
-        Draw this branch and all its children.
+        Append a subtree grown in a separate ArenaTree below one of this tree's branches.
         
         Args:
-            surface: Pygame surface to draw on
-            color_scheme: Current color scheme
+            root: Index of the branch the subtree was grown from
+            rows: Per-branch arrays of the subtree (see ARENA_ARRAYS), whose first row
+                is the grown state of root itself
+            leaf_count: Branch ends of the subtree
         """
-        if self.static:
-            return  # Skip drawing if already drawn to static surface
+        count = len(rows['depth']) - 1
+        while self.size + count > self.capacity:
+            self._grow_capacity()
         
-        end = self.get_end()
-        color = self.get_color(color_scheme)
-        thickness = max(1, 8 - self.depth)
+        new = slice(self.size, self.size + count)
+        for name in ARENA_ARRAYS:
+            getattr(self, name)[new] = rows[name][1:]
+        for name in ('length', 'end_x', 'end_y', 'flags', 'unstatic_children'):
+            getattr(self, name)[root] = rows[name][0]
         
-        pygame.draw.line(surface, color, self.start, end, thickness)
+        # Subtree row j > 0 lands at size + j - 1, and row 0 is root
+        parents = rows['parent_idx'][1:]
+        self.parent_idx[new] = np.where(parents == 0, root, parents + (self.size - 1))
+        self.size += count
+        self.leaf_count += leaf_count - 1  # root was already counted as a branch end
+    
+    def live_branches(self) -> np.ndarray:
+        """
+        Get the branches that are not static yet.
         
-        # Draw all children
-        for child in self.children:
-            child.draw(surface, color_scheme)
+        Returns:
+            Array of branch indices
+        """
+        if self.live_end < self.size:
+            # Branches added since the last call are all live
+            self.live = np.concatenate((self.live, np.arange(self.live_end, self.size)))
+            self.live_end = self.size
+        return self.live
     
-    def draw_static(self, surface: pygame.Surface, color_scheme: str = "green") -> None:
+    def retire(self, indices: np.ndarray) -> None:
         """
-        Draw this branch to the static surface for performance.
+        Mark branches as static and drop them from the live working set.
         
         Args:
-            surface: Static surface for performance optimization
-            color_scheme: Current color scheme
+            indices: Indices of live branches
         """
-        end = self.get_end()
-        color = self.get_color(color_scheme)
-        thickness = max(1, 8 - self.depth)
-        
-        pygame.draw.line(surface, color, self.start, end, thickness)
+        self.flags[indices] |= STATIC
+        parents = self.parent_idx[indices]
+        np.subtract.at(self.unstatic_children, parents[parents >= 0], 1)
+        live = self.live_branches()
+        self.live = live[(self.flags[live] & STATIC) == 0]
+    
+    def can_spawn(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Mask of branches allowed to spawn children once fully grown.
         
-        # Draw all children
-        for child in self.children:
-            child.draw_static(surface, color_scheme)
+        Args:
+            indices: Indices of the branches
+            
+        Returns:
+            Boolean array, in the order of indices
+        """
+        return ((self.flags[indices] & FINISHED) == 0) & \
+               (self.depth[indices] < MAX_DEPTH) & \
+               (self.target_length[indices] > MIN_BRANCH_LENGTH)
     
-    def update(self, grow_this_frame: bool) -> None:
+    def grow_all(self, indices: np.ndarray) -> None:
         """
-        Update this branch and all its children.
+        Grow the selected branches by GROWTH_SPEED, clamped to their target length,
+        and move their end points. Branches that stop growing keep their end point.
         
         Args:
-            grow_this_frame: Whether to grow this frame
+            indices: Indices of the branches to grow
         """
-        if not self.static:
-            if grow_this_frame:
-                self.grow()
-            
-            # Update all children
-            for child in self.children:
-                child.update(grow_this_frame)
+        length = np.minimum(self.length[indices] + GROWTH_SPEED, self.target_length[indices])
+        self.length[indices] = length
+        self.end_x[indices] = self.start_x[indices] + length * self.cos_a[indices]
+        self.end_y[indices] = self.start_y[indices] + length * self.sin_a[indices]
     
-    def count_branch_ends(self) -> int:
+    def end_points(self, indices: np.ndarray) -> tuple:
         """
-        Count the total number of branch ends (leaf nodes) in this subtree.
+        Get the cached end positions of branches.
         
+        Args:
+            indices: Indices of the branches
+            
         Returns:
-            Number of branch ends
+            Tuple of (end_x, end_y) arrays, in the order of indices
         """
-        if not self.children:
-            return 1  # This is a leaf
+        return self.end_x[indices], self.end_y[indices]
+
+
+def new_tree() -> ArenaTree:
+    """
+    Create a tree holding only the trunk, growing up from the bottom center.
+    
+    Returns:
+        New ArenaTree
+    """
+    tree = ArenaTree()
+    tree.add_branch(WIDTH // 2, HEIGHT - 50, -math.pi / 2, 100, 1)
+    return tree
+
+
+def _compute_color(color_scheme: str, depth: int) -> tuple:
+    """
+    Compute the color for a branch based on depth and color scheme.
+    
+    Args:
+        color_scheme: Color scheme name
+        depth: Depth of the branch in the tree
         
-        return sum(child.count_branch_ends() for child in self.children)
+    Returns:
+        RGB color tuple
+    """
+    depth_factor = min(depth * 15, 200)
+    
+    if color_scheme == "green":
+        return (0, 255 - depth_factor, 0)
+    elif color_scheme == "autumn":
+        return (255 - depth_factor, 100 + depth_factor // 2, 0)
+    elif color_scheme == "winter":
+        return (200 - depth_factor, 200 - depth_factor, 255 - depth_factor)
+    elif color_scheme == "spring":
+        return (255 - depth_factor, 100 + depth_factor // 2, 200 - depth_factor)
+    elif color_scheme == "summer":
+        return (255 - depth_factor, 255 - depth_factor // 2, 0)
+    elif color_scheme == "fire":
+        return (255, 100 + depth_factor // 2, 0)
+    elif color_scheme == "ocean":
+        return (0, 150 + depth_factor // 2, 255 - depth_factor)
+    elif color_scheme == "sunset":
+        return (255 - depth_factor, 50 + depth_factor // 2, 150 + depth_factor // 2)
+    elif color_scheme == "forest":
+        return (0, 150 - depth_factor // 2, 0)
+    elif color_scheme == "desert":
+        return (200 - depth_factor // 2, 150 - depth_factor // 3, 50)
+    elif color_scheme == "arctic":
+        return (180 - depth_factor, 200 - depth_factor, 255 - depth_factor // 2)
+    elif color_scheme == "tropical":
+        return (255 - depth_factor, 100 + depth_factor, 0)
+    elif color_scheme == "mountain":
+        return (150 - depth_factor, 150 - depth_factor, 160 - depth_factor)
+    elif color_scheme == "sunrise":
+        return (255 - depth_factor // 2, 200 - depth_factor // 2, 0)
+    elif color_scheme == "midnight":
+        return (50 + depth_factor // 2, 0, 100 + depth_factor // 2)
+    elif color_scheme == "lavender":
+        return (200 - depth_factor, 150 - depth_factor // 2, 255 - depth_factor)
+    elif color_scheme == "coral":
+        return (255 - depth_factor, 100 - depth_factor // 2, 100 - depth_factor // 2)
+    elif color_scheme == "emerald":
+        return (0, 200 - depth_factor // 2, 100 - depth_factor // 3)
+    elif color_scheme == "amber":
+        return (255 - depth_factor // 2, 200 - depth_factor // 2, 0)
+    elif color_scheme == "crimson":
+        return (200 - depth_factor // 2, 0, 0)
+    elif color_scheme == "azure":
+        return (0, 150 - depth_factor // 2, 255 - depth_factor)
+    elif color_scheme == "violet":
+        return (150 - depth_factor // 2, 0, 200 - depth_factor // 2)
+    elif color_scheme == "copper":
+        return (200 - depth_factor // 2, 100 - depth_factor // 3, 50)
+    elif color_scheme == "silver":
+        return (180 - depth_factor, 180 - depth_factor, 180 - depth_factor)
+    elif color_scheme == "gold":
+        return (255 - depth_factor // 2, 215 - depth_factor // 2, 0)
+    elif color_scheme == "rose":
+        return (255 - depth_factor, 100 - depth_factor // 2, 150 - depth_factor // 2)
+    elif color_scheme == "teal":
+        return (0, 150 - depth_factor // 2, 150 - depth_factor // 2)
+    elif color_scheme == "maroon":
+        return (150 - depth_factor // 2, 0, 0)
+    elif color_scheme == "navy":
+        return (0, 0, 150 - depth_factor // 2)
+    elif color_scheme == "lime":
+        return (150 - depth_factor // 2, 255 - depth_factor, 0)
+    elif color_scheme == "magenta":
+        return (255 - depth_factor, 0, 255 - depth_factor)
+    elif color_scheme == "cyan":
+        return (0, 255 - depth_factor, 255 - depth_factor)
+    else:
+        return (0, 255 - depth_factor, 0)  # Default green
+
+
+# Branch color per color scheme and depth, and line thickness per depth
+COLOR_TABLE = {scheme: [_compute_color(scheme, depth) for depth in range(MAX_DEPTH + 2)]
+               for scheme in COLOR_SCHEMES}
+THICKNESS = [max(1, 8 - depth) for depth in range(MAX_DEPTH + 2)]
+THIN_DEPTH = THICKNESS.index(1)  # Branches this deep and deeper are drawn 1 pixel wide
+
+# 8-bit palettes per color scheme, indexed by depth. Index 0 (no branch has depth 0)
+# is the transparent colorkey
+PALETTES = {scheme: [(0, 0, 0)] + colors[1:] for scheme, colors in COLOR_TABLE.items()}
+
+
+def new_palette_surface(color_scheme: str = "green") -> pygame.Surface:
+    """
+    Create a transparent 8-bit surface that branches are drawn onto by depth, so it
+    can be recolored by swapping its palette instead of redrawing.
+    
+    Args:
+        color_scheme: Color scheme of the palette
+        
+    Returns:
+        Screen-sized palette surface
+    """
+    surface = pygame.Surface((WIDTH, HEIGHT), depth=8)
+    surface.set_palette(PALETTES.get(color_scheme, PALETTES["green"]))
+    surface.set_colorkey(0)
+    return surface
+
+
+def clip_line(x1, y1, x2, y2, width, height):
+    """
+    Clip a line to a surface the way pygame.draw.line does before stepping it.
+    
+    Liang-Barsky clipping against [0, width] x [0, height], with the clipped end
+    points rounded half away from zero. The line keeps its direction.
+    
+    Args:
+        x1, y1, x2, y2: Line end points in pixels
+        width, height: Surface size
+        
+    Returns:
+        Tuple of (visible, x1, y1, x2, y2) with the clipped end points
+    """
+    p2, p4 = x2 - x1, y2 - y1
+    t_min, t_max = 0.0, 1.0
+    for p, q_low, q_high in ((p2, x1, width - x1), (p4, y1, height - y1)):
+        if p == 0:
+            if q_low < 0 or q_high < 0:
+                return False, x1, y1, x2, y2
+            continue
+        # Parameters where the line crosses the low and high edge
+        t_low, t_high = -q_low / p, q_high / p
+        if p < 0:
+            t_low, t_high = t_high, t_low
+        t_min = max(t_min, t_low)
+        t_max = min(t_max, t_high)
+    if t_min > t_max:
+        return False, x1, y1, x2, y2
+    
+    dx_min, dy_min = p2 * t_min, p4 * t_min
+    dx_max, dy_max = p2 * t_max, p4 * t_max
+    return (True,
+            x1 + int(dx_min - 0.5 if dx_min < 0 else dx_min + 0.5),
+            y1 + int(dy_min - 0.5 if dy_min < 0 else dy_min + 0.5),
+            x1 + int(dx_max - 0.5 if dx_max < 0 else dx_max + 0.5),
+            y1 + int(dy_max - 0.5 if dy_max < 0 else dy_max + 0.5))
+
+
+def rasterize_lines(pixels, start_x, start_y, end_x, end_y, colors):
+    """
+    Draw 1 pixel wide lines into a pixel array, pixel for pixel like pygame.draw.line.
+    
+    Each line is clipped to the surface first (see clip_line), so off-surface parts
+    are never stepped.
+    
+    Args:
+        pixels: 2D pixel array of the surface, indexed [x, y]
+        start_x, start_y, end_x, end_y: Line end points, truncated to pixels
+        colors: Mapped color of each line
+    """
+    width, height = pixels.shape
+    for k in range(start_x.shape[0]):
+        visible, x, y, x_end, y_end = clip_line(int(start_x[k]), int(start_y[k]),
+                                                int(end_x[k]), int(end_y[k]),
+                                                width, height)
+        if not visible:
+            continue
+        color = colors[k]
+        dx, dy = abs(x_end - x), abs(y_end - y)
+        step_x = 1 if x < x_end else -1
+        step_y = 1 if y < y_end else -1
+        err = dx // 2 if dx > dy else -(dy // 2)
+        # The clip box includes the far edges, so the bounds check is still needed
+        while x != x_end or y != y_end:
+            if 0 <= x < width and 0 <= y < height:
+                pixels[x, y] = color
+            e2 = err
+            if e2 > -dx:
+                err -= dy
+                x += step_x
+            if e2 < dy:
+                err += dx
+                y += step_y
+        if 0 <= x_end < width and 0 <= y_end < height:
+            pixels[x_end, y_end] = color
+
+
+if njit is not None:
+    clip_line = njit(cache=True)(clip_line)
+    rasterize_lines = njit(cache=True)(rasterize_lines)
+
+
+def draw_branches(tree: ArenaTree, surface: pygame.Surface, indices: np.ndarray,
+                  color_scheme: str = "green") -> None:
+    """
+    Draw the given branches.
+    
+    Args:
+        tree: Tree holding the branches
+        surface: Pygame surface to draw on; 8-bit palette surfaces are drawn with
+            the branch depth as color index and ignore color_scheme
+        indices: Indices of the branches to draw
+        color_scheme: Current color scheme
+    """
+    thin_indices = None
+    if surface.get_bitsize() == 8:
+        colors = range(len(THICKNESS))
+        if njit is not None:
+            # Thin branches, most of a grown tree, are rasterized in one compiled pass
+            # after the thick ones are drawn below
+            thin = tree.depth[indices] >= THIN_DEPTH
+            thin_indices, indices = indices[thin], indices[~thin]
+    else:
+        colors = COLOR_TABLE.get(color_scheme, COLOR_TABLE["green"])
+    end_x, end_y = tree.end_points(indices)
+    for depth, sx, sy, ex, ey in zip(tree.depth[indices].tolist(),
+                                      tree.start_x[indices].tolist(),
+                                      tree.start_y[indices].tolist(),
+                                      end_x.tolist(), end_y.tolist()):
+        pygame.draw.line(surface, colors[depth], (sx, sy), (ex, ey), THICKNESS[depth])
+    
+    if thin_indices is not None:
+        end_x, end_y = tree.end_points(thin_indices)
+        pixels = pygame.surfarray.pixels2d(surface)
+        rasterize_lines(pixels, tree.start_x[thin_indices], tree.start_y[thin_indices],
+                        end_x, end_y, tree.depth[thin_indices].astype(np.uint8))
+        del pixels  # Unlock the surface
+
+
+def draw_tree(tree: ArenaTree, surface: pygame.Surface, color_scheme: str = "green") -> None:
+    """
+    Draw all branches that are not yet on the static surface.
+    
+    Args:
+        tree: Tree to draw
+        surface: Pygame surface to draw on
+        color_scheme: Current color scheme
+    """
+    draw_branches(tree, surface, tree.live_branches(), color_scheme)
+
+
+def branch_bounds(tree: ArenaTree, indices: np.ndarray):
+    """
+    Get the screen area covered by branches, including their line thickness.
+    
+    Args:
+        tree: Tree holding the branches
+        indices: Indices of the branches
+        
+    Returns:
+        pygame.Rect clipped to the screen, or None if there are no branches
+    """
+    if not indices.size:
+        return None
+    pad = THICKNESS[0]
+    left = math.floor(min(tree.start_x[indices].min(), tree.end_x[indices].min())) - pad
+    top = math.floor(min(tree.start_y[indices].min(), tree.end_y[indices].min())) - pad
+    right = math.ceil(max(tree.start_x[indices].max(), tree.end_x[indices].max())) + pad
+    bottom = math.ceil(max(tree.start_y[indices].max(), tree.end_y[indices].max())) + pad
+    return pygame.Rect(left, top, right - left, bottom - top).clip(screen.get_rect())
+
+
+def draw_static(tree: ArenaTree, surface: pygame.Surface, color_scheme: str = "green") -> None:
+    """
+    Draw every branch of the tree to the static surface.
+    
+    Args:
+        tree: Tree to draw
+        surface: Static surface for performance optimization
+        color_scheme: Current color scheme
+    """
+    draw_branches(tree, surface, np.arange(tree.size), color_scheme)
+
+
+def update_tree(tree: ArenaTree, grow_this_frame: bool) -> None:
+    """
+    Grow all live branches, spawn children and retire finished subtrees.
+    
+    This is the core of the tree reaction algorithm - each branch grows
+    over time and spawns new branches when it reaches its target length.
+    
+    Args:
+        tree: Tree to update
+        grow_this_frame: Whether to grow this frame
+    """
+    if not grow_this_frame:
+        return
+    
+    # Branches that have reached target length create their children
+    live = tree.live_branches()
+    grown = live[tree.length[live] >= tree.target_length[live]]
+    ready = grown[tree.can_spawn(grown)]
+    if ready.size:
+        end_x, end_y = tree.end_points(ready)
+        for i, ex, ey in zip(ready.tolist(), end_x.tolist(), end_y.tolist()):
+            tree.spawn_children(i, ex, ey)
+    
+    # Grow the branch lengths, including the children created above
+    live = tree.live_branches()
+    if _step_cython is not None:
+        _step_cython(np.asarray(live, dtype=np.intp), tree.length, tree.target_length,
+                     tree.start_x, tree.start_y, tree.cos_a, tree.sin_a, tree.end_x, tree.end_y,
+                     GROWTH_SPEED)
+    else:
+        tree.grow_all(live[tree.length[live] < tree.target_length[live]])
+    
+    # Mark as static if finished and all children are static, drawing the newly
+    # static branches (their children are already drawn) to the static surface
+    finished = live[(tree.flags[live] & FINISHED) != 0]
+    newly_static = finished[tree.unstatic_children[finished] == 0]
+    if newly_static.size:
+        tree.retire(newly_static)
+        draw_branches(tree, static_surface, newly_static)
 
 
 def draw_button(surface: pygame.Surface, x: int, y: int, radius: int, color: tuple, text: str = "") -> None:
@@ -339,9 +765,9 @@ def draw_button(surface: pygame.Surface, x: int, y: int, radius: int, color: tup
     pygame.draw.circle(surface, color, (x, y), radius)
     
     if text:
-        font = pygame.font.Font(None, 16)
-        font.set_bold(True)
-        text_surface = font.render(text, True, (0, 0, 0))  # Black text
+        text_surface = BUTTON_TEXT.get(text)
+        if text_surface is None:
+            text_surface = BUTTON_TEXT[text] = BUTTON_FONT.render(text, True, (0, 0, 0))  # Black text
         text_rect = text_surface.get_rect(center=(x, y))
         surface.blit(text_surface, text_rect)
 
@@ -362,48 +788,227 @@ def is_button_clicked(mouse_pos: tuple, button_x: int, button_y: int, radius: in
     return distance <= radius
 
 
-def instant_grow_all_branches(branches: list) -> None:
+def _get_instant_grow_pool():
+    """
+    Get the worker pool for instant growth, starting it on first use.
+    
+    Returns:
+        multiprocessing Pool, or None if subtrees should be grown in this process
+    """
+    global _instant_grow_pool
+    
+    # Workers are forked so they do not re-run the pygame setup at import, and the
+    # trunk has at most 3 subtrees to hand out. Forking after SDL has started is only
+    # safe on Linux (macOS lists fork, but its Cocoa/SDL state breaks in the child)
+    workers = min(os.cpu_count() or 1, 3)
+    if workers < 2 or not sys.platform.startswith("linux"):
+        return None
+    if _instant_grow_pool is None:
+        _instant_grow_pool = multiprocessing.get_context("fork").Pool(
+            workers, initializer=_init_instant_grow_worker)
+        atexit.register(_instant_grow_pool.terminate)
+    return _instant_grow_pool
+
+
+def _init_instant_grow_worker() -> None:
+    """
+    Restore default SIGTERM handling in a forked worker, which inherits SDL's handler
+    (it turns the signal into a quit event) and would otherwise ignore Pool.terminate.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _build_subtree(params: tuple) -> tuple:
+    """
+    Grow a subtree instantly in a worker process.
+    
+    Args:
+        params: Tuple of (seed, start_x, start_y, angle, length, depth) for the
+            subtree's first branch
+        
+    Returns:
+        Tuple of (rows, leaf_count) as taken by ArenaTree.merge_subtree
+    """
+    seed, start_x, start_y, angle, length, depth = params
+    seed_samples(seed)
+    
+    subtree = ArenaTree()
+    subtree.add_branch(start_x, start_y, angle, length, depth)
+    grow_branch_instantly(subtree, 0)
+    
+    n = subtree.size
+    return {name: getattr(subtree, name)[:n] for name in ARENA_ARRAYS}, subtree.leaf_count
+
+
+def instant_grow_all_branches(tree: ArenaTree) -> None:
     """
     Instantly grow all branches to their full length.
     
+    Uses the Numba kernel when Numba is installed. Otherwise the subtrees below
+    each root's children, which are independent, are grown in parallel worker
+    processes when more than one CPU is available.
+    
+    Args:
+        tree: Tree to grow
+    """
+    # The compiled kernel grows a whole tree faster than the pool can hand out work
+    if njit is not None:
+        for root in np.flatnonzero(tree.parent_idx[:tree.size] < 0).tolist():
+            grow_subtree_compiled(tree, root)
+        return
+    
+    pool = _get_instant_grow_pool()
+    for root in np.flatnonzero(tree.parent_idx[:tree.size] < 0).tolist():
+        if pool is None or tree.flags[root] & FINISHED:
+            grow_branch_instantly(tree, root)
+            continue
+        
+        # Grow the root here, without descending into its children
+        length = tree.target_length[root]
+        tree.length[root] = length
+        tree.end_x[root] = tree.start_x[root] + length * tree.cos_a[root]
+        tree.end_y[root] = tree.start_y[root] + length * tree.sin_a[root]
+        if tree.depth[root] >= MAX_DEPTH or length <= MIN_BRANCH_LENGTH:
+            continue
+        children = tree.spawn_children(root, float(tree.end_x[root]), float(tree.end_y[root]))
+        
+        # Each worker seeds its own generator from this process's generator
+        params = [(int(_rng.integers(2 ** 63)), float(tree.start_x[child]), float(tree.start_y[child]),
+                   float(tree.angle[child]), float(tree.target_length[child]), int(tree.depth[child]))
+                  for child in children]
+        for child, (rows, leaf_count) in zip(children, pool.map(_build_subtree, params)):
+            tree.merge_subtree(child, rows, leaf_count)
+
+
+def build_subtree_numba(start_x, start_y, angle, cos_a, sin_a, length, target_length,
+                        end_x, end_y, depth, parent_idx, flags, unstatic_children,
+                        n_nodes, stack, top, rng,
+                        branch_angle, branch_factor, min_length, max_depth):
+    """
+    Grow the branches on an explicit DFS stack to full length, creating their children.
+    
+    Children are appended to the arena arrays at n_nodes[0] in the same order as
+    ArenaTree.spawn_children. Stops early when the arrays have no room left for
+    another spawn, so the caller can grow the arena and call again with the stack.
+    
     Args:
-        branches: List of branch objects
+        start_x ... unstatic_children: Arena arrays of the tree
+        n_nodes: Length-1 array holding the number of used rows, updated in place
+        stack: Branch indices still to grow
+        top: Number of entries on the stack
+        rng: Generator to draw the child counts, angles and lengths from
+        branch_angle, branch_factor, min_length, max_depth: Growth parameters
+        
+    Returns:
+        Tuple of (entries left on the stack, change in the number of branch ends)
     """
-    for branch in branches:
-        grow_branch_instantly(branch)
+    capacity = start_x.shape[0]
+    size = n_nodes[0]
+    leaf_delta = 0
+    while top > 0 and size + 3 <= capacity:
+        top -= 1
+        i = stack[top]
+        
+        # Grow this branch to full length
+        full = target_length[i]
+        length[i] = full
+        end_x[i] = start_x[i] + full * cos_a[i]
+        end_y[i] = start_y[i] + full * sin_a[i]
+        if flags[i] & FINISHED or depth[i] >= max_depth or full <= min_length:
+            continue
+        
+        # Create 2-3 child branches, as in ArenaTree.spawn_children
+        flags[i] |= FINISHED
+        first = size
+        for b in range(rng.integers(2, 4)):
+            delta = 0.0
+            if depth[i] != 1:
+                delta = rng.uniform(-branch_angle, branch_angle)
+            new_length = full * rng.uniform(0.8, branch_factor)
+            if new_length >= min_length:
+                child_angle = angle[i] + delta
+                start_x[size] = end_x[i]
+                start_y[size] = end_y[i]
+                angle[size] = child_angle
+                cos_a[size] = math.cos(child_angle)
+                sin_a[size] = math.sin(child_angle)
+                length[size] = 0.0
+                target_length[size] = new_length
+                end_x[size] = end_x[i]
+                end_y[size] = end_y[i]
+                depth[size] = depth[i] + 1
+                parent_idx[size] = i
+                flags[size] = 0
+                unstatic_children[size] = 0
+                size += 1
+        
+        # Push the children in reverse so they are grown in creation order
+        if size > first:
+            unstatic_children[i] += size - first
+            leaf_delta += size - first - 1
+            for child in range(size - 1, first - 1, -1):
+                stack[top] = child
+                top += 1
+    
+    n_nodes[0] = size
+    return top, leaf_delta
+
 
+if njit is not None:
+    build_subtree_numba = njit(cache=True)(build_subtree_numba)
 
-def grow_branch_instantly(branch) -> None:
+
+def grow_subtree_compiled(tree: ArenaTree, i: int) -> None:
     """
-    Recursively grow a branch and all its children instantly.
+    Instantly grow a branch and all its children with the Numba kernel.
     
     Args:
-        branch: Branch object to grow
+        tree: Tree holding the branch
+        i: Index of the branch to grow
     """
-    # Grow this branch to full length
-    branch.length = branch.target_length
+    # Each spawn pushes at most 3 children, one level deeper than the branch it pops
+    stack = np.empty(MAX_DEPTH * 3, np.int32)
+    stack[0] = i
+    top = 1
+    n_nodes = np.array([tree.size], np.int64)
+    while top:
+        if tree.size + 3 > tree.capacity:
+            tree._grow_capacity()
+        top, leaf_delta = build_subtree_numba(
+            *(getattr(tree, name) for name in ARENA_ARRAYS), n_nodes, stack, top, _rng,
+            BRANCH_ANGLE, BRANCH_FACTOR, MIN_BRANCH_LENGTH, MAX_DEPTH)
+        tree.size = int(n_nodes[0])
+        tree.leaf_count += leaf_delta
+
+
+def grow_branch_instantly(tree: ArenaTree, i: int) -> None:
+    """
+    Grow a branch and all its children instantly.
+    
+    Branches are grown depth first from an explicit stack rather than by recursion.
     
-    # Create children if conditions are met
-    if (not branch.finished and 
-        branch.depth < MAX_DEPTH and 
-        branch.target_length > MIN_BRANCH_LENGTH):
+    Args:
+        tree: Tree holding the branch
+        i: Index of the branch to grow
+    """
+    stack = [i]
+    while stack:
+        i = stack.pop()
         
-        branch.finished = True
-        end = branch.get_end()
-        num_branches = random.choice([2, 3])
+        # Grow this branch to full length
+        length = tree.target_length[i]
+        tree.length[i] = length
+        tree.end_x[i] = tree.start_x[i] + length * tree.cos_a[i]
+        tree.end_y[i] = tree.start_y[i] + length * tree.sin_a[i]
         
-        for _ in range(num_branches):
-            if branch.depth == 1:
-                delta = 0
-            else:
-                delta = random.uniform(-BRANCH_ANGLE, BRANCH_ANGLE)
+        # Create children if conditions are met, pushed in reverse so they are
+        # grown in creation order
+        if (not tree.flags[i] & FINISHED and 
+            tree.depth[i] < MAX_DEPTH and 
+            length > MIN_BRANCH_LENGTH):
             
-            new_length = branch.target_length * random.uniform(0.8, BRANCH_FACTOR)
-            
-            if new_length >= MIN_BRANCH_LENGTH:
-                child = Branch(end, branch.angle + delta, new_length, branch.depth + 1)
-                branch.children.append(child)
-                grow_branch_instantly(child)  # Recursively grow children
+            children = tree.spawn_children(i, float(tree.end_x[i]), float(tree.end_y[i]))
+            stack.extend(reversed(children))
 
 
 def main():
@@ -412,16 +1017,18 @@ def main():
     
     Handles user input, updates the tree growth, and renders the display.
     """
-    global static_surface
-    
     running = True
     growing = False
     paused = False
-    branches = []
+    tree = ArenaTree()
     frame_count = 0
     current_color_scheme = 0  # Index into COLOR_SCHEMES
     instant_grow_mode = False
     fast_grow_mode = False  # For button 3 (2x faster growth)
+    frozen_surface = None   # Live branches of a tree that stopped updating, drawn once
+    frozen_scheme = None    # Color scheme frozen_surface was drawn with
+    pending_rect = screen.get_rect()  # Area changed outside the growing branches
+    live_rect = None        # Screen area of the live branches when last drawn
     
     
     while running:
@@ -429,29 +1036,34 @@ def main():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                pending_rect = screen.get_rect()
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                 # Spacebar updates color for button 3 trees
-                if fast_grow_mode and branches:
+                if fast_grow_mode and tree:
                     current_color_scheme = (current_color_scheme + 1) % len(COLOR_SCHEMES)
-                    # Redraw static surface with new color
-                    static_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                    for branch in branches:
-                        branch.draw_static(static_surface, COLOR_SCHEMES[current_color_scheme])
+                    # Redraw static surface with new color, only where the tree is
+                    tree_rect = branch_bounds(tree, np.arange(tree.size))
+                    static_surface.fill(BACKGROUND_COLOR, tree_rect)
+                    draw_static(tree, static_surface, COLOR_SCHEMES[current_color_scheme])
+                    pending_rect = tree_rect if pending_rect is None else pending_rect.union(tree_rect)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
+                pending_rect = screen.get_rect()
                 
                 # Check button 1 (Instant Grow)
                 if is_button_clicked(mouse_pos, BUTTON1_X, BUTTON_Y, BUTTON_RADIUS):
                     # Always create a new tree and grow it instantly
-                    static_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                    branches = [Branch((WIDTH // 2, HEIGHT - 50), -math.pi / 2, 100, 1)]
+                    static_surface.fill(BACKGROUND_COLOR)
+                    frozen_surface = None
+                    tree = new_tree()
                     growing = True
                     paused = False
                     instant_grow_mode = False
                     fast_grow_mode = False
                     frame_count = 0
                     # Grow instantly
-                    instant_grow_all_branches(branches)
+                    instant_grow_all_branches(tree)
                     instant_grow_mode = True
                     paused = True
                 
@@ -463,19 +1075,17 @@ def main():
                 # Check button 3 (Fast Grow)
                 elif is_button_clicked(mouse_pos, BUTTON3_X, BUTTON_Y, BUTTON_RADIUS):
                     # Create a new tree and grow it 2x faster
-                    static_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                    branches = [Branch((WIDTH // 2, HEIGHT - 50), -math.pi / 2, 100, 1)]
+                    static_surface.fill(BACKGROUND_COLOR)
+                    frozen_surface = None
+                    tree = new_tree()
                     growing = True
                     paused = False
                     instant_grow_mode = False
                     fast_grow_mode = True
                     frame_count = 0
         
-        # Clear screen with dark background
-        screen.fill((10, 10, 30))
-        
-        # Blit static surface (fully grown branches for performance)
-        screen.blit(static_surface, (0, 0))
+        # Screen area to redraw this frame; nothing is redrawn while the scene is unchanged
+        dirty_rect, pending_rect = pending_rect, None
         
         # Determine if we should grow this frame
         if fast_grow_mode:
@@ -486,61 +1096,81 @@ def main():
             grow_this_frame = (frame_count % GROW_EVERY_N_FRAMES == 0)
         current_scheme = COLOR_SCHEMES[current_color_scheme]
         
-        if growing and not paused and branches:
-            # Update and draw growing branches
-            for branch in branches:
-                branch.update(grow_this_frame)
-                branch.draw(screen, current_scheme)
-            
-            # Count total branch ends for performance monitoring
-            total_ends = sum(branch.count_branch_ends() for branch in branches)
+        animating = growing and not paused and tree
+        if animating:
+            if grow_this_frame:
+                # Update growing branches. Redraw where the live branches were, which
+                # covers those that became static, and where they are now
+                update_tree(tree, grow_this_frame)
+                new_live_rect = branch_bounds(tree, tree.live_branches())
+                for rect in (live_rect, new_live_rect):
+                    if rect is not None:
+                        dirty_rect = rect if dirty_rect is None else dirty_rect.union(rect)
+                live_rect = new_live_rect
             
             # Pause if we've reached the performance limit
-            if total_ends >= MAX_BRANCH_ENDS:
+            if tree.leaf_count >= MAX_BRANCH_ENDS:
                 paused = True
             
             # Check if tree is finished growing (all branches are static)
-            if branches and all(branch.static for branch in branches):
+            if tree and tree.flags[0] & STATIC:
                 growing = False
+                pending_rect = screen.get_rect()
         
         elif paused or instant_grow_mode:
-            # Draw the finished tree
-            for branch in branches:
-                branch.draw(screen, current_scheme)
-        
-        # Draw UI elements
-        # Button 1 (Instant Grow) - Bright green
-        button1_color = (0, 255, 0)  # Bright green
-        draw_button(screen, BUTTON1_X, BUTTON_Y, BUTTON_RADIUS, button1_color, "1")
-        
-        # Button 2 (Color Change) - Bright red
-        button2_color = (255, 0, 0)  # Bright red
-        draw_button(screen, BUTTON2_X, BUTTON_Y, BUTTON_RADIUS, button2_color, "2")
-        
-        # Button 3 (Fast Grow) - Bright blue
-        button3_color = (0, 0, 255)  # Bright blue
-        draw_button(screen, BUTTON3_X, BUTTON_Y, BUTTON_RADIUS, button3_color, "3")
-        
-        # Show button instructions in top left
-        font = pygame.font.Font(None, 20)
-        instructions = [
-            "1 = Instant growth",
-            "2 = Tree Color", 
-            "3 = Slow Growth"
-        ]
-        for i, instruction in enumerate(instructions):
-            text_surface = font.render(instruction, True, (255, 255, 255))
-            screen.blit(text_surface, (10, 10 + i * 25))
-        
-        # Show spacebar instruction when button 3 tree is grown
-        if fast_grow_mode and branches and not growing:
-            space_font = pygame.font.Font(None, 18)
-            space_text = space_font.render("SPACEBAR = Update Color", True, (255, 255, 255))
-            screen.blit(space_text, (BUTTON3_X - 40, BUTTON_Y + 25))
-        
-        # Update display
-        pygame.display.flip()
-        clock.tick(60)
+            # The finished tree no longer changes, so its branches are drawn once and
+            # blitted as a single surface afterwards. Color changes swap its palette
+            if frozen_surface is None:
+                frozen_surface = new_palette_surface(current_scheme)
+                draw_tree(tree, frozen_surface)
+                frozen_scheme = current_scheme
+                dirty_rect = screen.get_rect()
+            elif frozen_scheme != current_scheme:
+                frozen_surface.set_palette(PALETTES[current_scheme])
+                frozen_scheme = current_scheme
+                dirty_rect = screen.get_rect()
+        
+        if dirty_rect is not None:
+            # The UI is redrawn whole whenever the redrawn area reaches it
+            draw_ui = dirty_rect.colliderect(UI_RECT)
+            if draw_ui:
+                dirty_rect = dirty_rect.union(UI_RECT)
+            
+            # Copy the background and fully grown branches from the static surface
+            screen.blit(static_surface, dirty_rect, dirty_rect)
+            
+            if animating:
+                draw_tree(tree, screen, current_scheme)
+            elif paused or instant_grow_mode:
+                screen.blit(frozen_surface, dirty_rect, dirty_rect)
+            
+            if draw_ui:
+                # Draw UI elements
+                # Button 1 (Instant Grow) - Bright green
+                button1_color = (0, 255, 0)  # Bright green
+                draw_button(screen, BUTTON1_X, BUTTON_Y, BUTTON_RADIUS, button1_color, "1")
+                
+                # Button 2 (Color Change) - Bright red
+                button2_color = (255, 0, 0)  # Bright red
+                draw_button(screen, BUTTON2_X, BUTTON_Y, BUTTON_RADIUS, button2_color, "2")
+                
+                # Button 3 (Fast Grow) - Bright blue
+                button3_color = (0, 0, 255)  # Bright blue
+                draw_button(screen, BUTTON3_X, BUTTON_Y, BUTTON_RADIUS, button3_color, "3")
+                
+                # Show button instructions in top left
+                for i, text_surface in enumerate(INSTRUCTION_SURFACES):
+                    screen.blit(text_surface, (10, 10 + i * 25))
+                
+                # Show spacebar instruction when button 3 tree is grown
+                if fast_grow_mode and tree and not growing:
+                    screen.blit(SPACEBAR_SURFACE, (BUTTON3_X - 40, BUTTON_Y + 25))
+            
+            # Update only the redrawn area of the display
+            pygame.display.update(dirty_rect)
+        
+        # Nothing moves while no tree is animating, so input is polled less often
+        clock.tick(ACTIVE_FPS if animating else IDLE_FPS)
         frame_count += 1
     
     pygame.quit()